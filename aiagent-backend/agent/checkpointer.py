@@ -0,0 +1,322 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+from db.storage import get_connection, transaction
+
+class _HotThread:
+    """Serialized latest checkpoint of a thread, kept in memory between turns."""
+
+    def __init__(self, row: tuple, writes: Dict[Tuple[str, int], tuple]):
+        # writes maps (task_id, idx) to (task_id, channel, type, value)
+        self.row = row
+        self.writes = writes
+        self.last_access = time.monotonic()
+
+class SqliteCheckpointSaver(BaseCheckpointSaver):
+    """
+    Checkpoint saver that persists conversation state in the agent's SQLite database.
+
+    The latest checkpoint of the most recently used threads is also kept in a small
+    in-memory LRU, so the next turn of an active conversation does not read the DB.
+    Entries idle for longer than `idle_seconds` are evicted from memory, and threads
+    not updated for `ttl_seconds` are pruned from the database. Each thread keeps only
+    its `keep_checkpoints` newest checkpoints, so its storage stays bounded however
+    long the conversation runs.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_size: int = 128,
+        idle_seconds: float = 900.0,
+        ttl_seconds: float = 30 * 24 * 3600,
+        prune_interval: float = 3600.0,
+        keep_checkpoints: int = 10,
+        serde: Optional[Any] = None
+    ):
+        super().__init__(serde=serde)
+        self.cache_size = cache_size
+        self.idle_seconds = idle_seconds
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval = prune_interval
+        self.keep_checkpoints = max(1, keep_checkpoints)
+
+        self._hot: "OrderedDict[Tuple[str, str], _HotThread]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    # In-memory working set
+
+    def _remember(self, key: Tuple[str, str], row: tuple, writes: Dict[Tuple[str, int], tuple]) -> None:
+        with self._lock:
+            self._hot[key] = _HotThread(row, writes)
+            self._hot.move_to_end(key)
+            self._evict()
+
+    def _recall(self, key: Tuple[str, str]) -> Optional[_HotThread]:
+        with self._lock:
+            hot = self._hot.get(key)
+            if hot:
+                hot.last_access = time.monotonic()
+                self._hot.move_to_end(key)
+            return hot
+
+    def _evict(self) -> None:
+        """Drop idle and least recently used threads from memory. Caller must hold the lock."""
+        cutoff = time.monotonic() - self.idle_seconds
+        while self._hot:
+            key, hot = next(iter(self._hot.items()))
+            if len(self._hot) <= self.cache_size and hot.last_access >= cutoff:
+                break
+            del self._hot[key]
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple, writes: Dict[Tuple[str, int], tuple]) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        return CheckpointTuple(
+            {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            self.serde.loads_typed((type_, checkpoint)),
+            self.serde.loads_typed((metadata_type, metadata)),
+            {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_checkpoint_id}}
+            if parent_checkpoint_id else None,
+            [
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in (writes[key] for key in sorted(writes))
+            ]
+        )
+
+    def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> Dict[Tuple[str, int], tuple]:
+        rows = get_connection().execute(
+            "SELECT task_id, idx, channel, type, value FROM checkpoint_writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+        return {(task_id, idx): (task_id, channel, value_type, value) for task_id, idx, channel, value_type, value in rows}
+
+    # BaseCheckpointSaver interface
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        hot = self._recall((thread_id, checkpoint_ns))
+        if hot and (checkpoint_id is None or checkpoint_id == hot.row[0]):
+            with self._lock:
+                writes = dict(hot.writes)
+            return self._to_tuple(thread_id, checkpoint_ns, hot.row, writes)
+
+        con = get_connection()
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        if checkpoint_id:
+            row = con.execute(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id)
+            ).fetchone()
+        else:
+            row = con.execute(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns)
+            ).fetchone()
+        if row is None:
+            return None
+
+        writes = self._load_writes(thread_id, checkpoint_ns, row[0])
+        if checkpoint_id is None:
+            self._remember((thread_id, checkpoint_ns), row, dict(writes))
+        return self._to_tuple(thread_id, checkpoint_ns, row, writes)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        count = 0
+        for thread_id, checkpoint_ns, *row in get_connection().execute(query, params).fetchall():
+            checkpoint_tuple = self._to_tuple(
+                thread_id, checkpoint_ns, tuple(row), self._load_writes(thread_id, checkpoint_ns, row[0])
+            )
+            if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            yield checkpoint_tuple
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_checkpoint_id = config["configurable"].get("checkpoint_id")
+
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
+        row = (checkpoint["id"], parent_checkpoint_id, type_, serialized_checkpoint, metadata_type, serialized_metadata)
+
+        with transaction() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "type, checkpoint, metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, *row)
+            )
+            con.execute(
+                "INSERT OR REPLACE INTO checkpoint_threads (thread_id, updated_at) VALUES (?, ?)",
+                (thread_id, time.time())
+            )
+            self._trim(con, thread_id, checkpoint_ns)
+
+        self._remember((thread_id, checkpoint_ns), row, {})
+        self._maybe_prune()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"]
+            }
+        }
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        # Special channels replace earlier writes; regular writes are only stored once
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, serialized_value = self.serde.dumps_typed(value)
+            rows.append((task_id, WRITES_IDX_MAP.get(channel, idx), channel, value_type, serialized_value))
+
+        with transaction() as con:
+            con.executemany(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO checkpoint_writes (thread_id, checkpoint_ns, "
+                "checkpoint_id, task_id, idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(thread_id, checkpoint_ns, checkpoint_id, *row) for row in rows]
+            )
+
+        hot = self._recall((thread_id, checkpoint_ns))
+        if hot and hot.row[0] == checkpoint_id:
+            with self._lock:
+                for task, idx, channel, value_type, value in rows:
+                    if replace or (task, idx) not in hot.writes:
+                        hot.writes[(task, idx)] = (task, channel, value_type, value)
+
+    # The async methods run the SQLite work on a worker thread: a write can wait up to
+    # the busy timeout, and put() may prune, neither of which may stall the event loop.
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    # Retention
+
+    def _trim(self, con: Any, thread_id: str, checkpoint_ns: str) -> None:
+        """Delete all but the newest `keep_checkpoints` checkpoints of a thread, with their writes."""
+        cutoff = con.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.keep_checkpoints)
+        ).fetchone()
+        if cutoff is None:
+            return
+        for table in ("checkpoint_writes", "checkpoints"):
+            con.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id <= ?",
+                (thread_id, checkpoint_ns, cutoff[0])
+            )
+
+    def _maybe_prune(self) -> None:
+        now = time.monotonic()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        self.prune()
+
+    def prune(self) -> int:
+        """
+        Delete threads not updated within the TTL. Returns the number of threads removed.
+        """
+        cutoff = time.time() - self.ttl_seconds
+        stale = "SELECT thread_id FROM checkpoint_threads WHERE updated_at < ?"
+        with transaction() as con:
+            thread_ids = [row[0] for row in con.execute(stale, (cutoff,)).fetchall()]
+            if thread_ids:
+                con.execute(f"DELETE FROM checkpoint_writes WHERE thread_id IN ({stale})", (cutoff,))
+                con.execute(f"DELETE FROM checkpoints WHERE thread_id IN ({stale})", (cutoff,))
+                con.execute("DELETE FROM checkpoint_threads WHERE updated_at < ?", (cutoff,))
+
+        if thread_ids:
+            with self._lock:
+                for key in [key for key in self._hot if key[0] in thread_ids]:
+                    del self._hot[key]
+        return len(thread_ids)
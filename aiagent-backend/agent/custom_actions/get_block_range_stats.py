@@ -0,0 +1,81 @@
+from web3 import Web3
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+import constants
+from chain.provider import get_web3
+from chain.batch import batch_request
+
+GAS_PRICE_PERCENTILES = [10, 50, 90, 99]
+
+def get_block_range_stats(last_n_blocks: int = 10, start_block: Optional[int] = None, end_block: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get activity statistics for a range of Base Sepolia blocks in a single call: transaction counts,
+    total value transferred, unique addresses and gas price percentiles across the window.
+
+    Use this instead of calling get_latest_block repeatedly when asked about activity over several blocks.
+
+    Args:
+        last_n_blocks (int, optional): Number of most recent blocks to summarize when no range is given. Defaults to 10.
+        start_block (int, optional): First block of an explicit range.
+        end_block (int, optional): Last block of an explicit range. Defaults to the latest block.
+    """
+    rpc_url = constants.BASE_SEPOLIA_RPC_URL
+
+    if end_block is None:
+        end_block = get_web3(rpc_url).eth.block_number
+    if start_block is None:
+        start_block = end_block - max(last_n_blocks, 1) + 1
+    start_block = max(start_block, end_block - constants.BLOCK_RANGE_MAX_BLOCKS + 1, 0)
+
+    numbers = list(range(start_block, end_block + 1))
+    blocks = batch_request(rpc_url, [("eth_getBlockByNumber", [hex(n), True]) for n in numbers])
+
+    # Collect columns straight from the raw JSON-RPC payload
+    tx_counts: List[int] = []
+    gas_prices: List[int] = []
+    senders: Set[str] = set()
+    receivers: Set[str] = set()
+    total_value_wei = 0
+    missing_blocks: List[int] = []
+
+    for number, block in zip(numbers, blocks):
+        if not block:
+            missing_blocks.append(number)
+            continue
+        transactions = block["transactions"]
+        tx_counts.append(len(transactions))
+        for tx in transactions:
+            senders.add(tx["from"])
+            if tx.get("to"):
+                receivers.add(tx["to"])
+            total_value_wei += int(tx["value"], 16)
+            if tx.get("gasPrice"):
+                gas_prices.append(int(tx["gasPrice"], 16))
+
+    counts = np.array(tx_counts, dtype=np.int64)
+    gas_gwei = np.array(gas_prices, dtype=np.float64) / 1e9
+
+    gas_price_stats = None
+    if gas_gwei.size:
+        percentiles = np.percentile(gas_gwei, GAS_PRICE_PERCENTILES)
+        gas_price_stats = {f"p{p}": round(float(v), 6) for p, v in zip(GAS_PRICE_PERCENTILES, percentiles)}
+        gas_price_stats["mean"] = round(float(gas_gwei.mean()), 6)
+
+    return {
+        "start_block": start_block,
+        "end_block": end_block,
+        "blocks_count": int(counts.size),
+        "missing_blocks": missing_blocks,
+        "transactions": {
+            "total": int(counts.sum()),
+            "per_block_mean": round(float(counts.mean()), 2) if counts.size else 0,
+            "per_block_max": int(counts.max()) if counts.size else 0
+        },
+        "total_value_transferred": float(Web3.from_wei(total_value_wei, 'ether')),
+        "address_summary": {
+            "unique_senders_count": len(senders),
+            "unique_receivers_count": len(receivers),
+            "total_unique_addresses": len(senders | receivers)
+        },
+        "gas_price_gwei": gas_price_stats
+    }
@@ -1,69 +1,131 @@
 from web3 import Web3
 from datetime import datetime
-from typing import Set, Dict, List, Any
-from decimal import Decimal
+from typing import Set, Dict, Iterator, Any, Optional
+import constants
+from chain.head_follower import BlockHeadFollower
 
-def get_latest_block() -> Dict[str, Any]:
+def summarize_block(latest_block: Any) -> Dict[str, Any]:
     """
-    Get real time block data from the Base Sepolia network, including all addresses involved in transactions
-    and total value transferred.
-    
-    This function MUST be called every time in order to receive the latest block information.
-    """
-    # Connect to Base Sepolia network
-    base_sepolia_rpc = "https://sepolia.base.org"
-    w3 = Web3(Web3.HTTPProvider(base_sepolia_rpc))
-    
-    # Check connection
-    if not w3.is_connected():
-        raise Exception("Failed to connect to Base Sepolia network")
+    Summarize a block fetched with full transactions into the data returned to the agent.
 
-    # Get latest block
-    latest_block = w3.eth.get_block('latest', full_transactions=True)
-    
+    Values are summed in integer wei and converted to ETH once, and no per-transaction
+    records are built; use iter_block_transactions for transaction detail.
+    """
     # Initialize sets to store unique addresses and total value
     sender_addresses: Set[str] = set()
     receiver_addresses: Set[str] = set()
-    total_value_eth: Decimal = Decimal('0')
-    
-    # Process all transactions in the block
-    transactions_data: List[Dict[str, Any]] = []
-    
+    total_value_wei = 0
+
     for tx in latest_block.transactions:
-        # Add sender address
         sender_addresses.add(tx["from"])
-        
-        # Add receiver address if it exists
+
+        # Contract creations have no receiver
         if tx["to"]:
             receiver_addresses.add(tx["to"])
 
-        # Convert value to ETH and add to total
-        tx_value_eth = Decimal(str(w3.from_wei(tx["value"], 'ether')))
-        total_value_eth += tx_value_eth
-        
-        # Store transaction data
-        tx_data = {
-            "hash": tx.hash.hex(),
-            "from": tx["from"],
-            "to": tx["to"] if tx["to"] else "Contract Creation",
-            "value": tx_value_eth,
-            "gas_price": w3.from_wei(tx["gasPrice"], 'gwei') if "gasPrice" in tx else None,
-            "gas": tx["gas"]
-        }
-        transactions_data.append(tx_data)
-    
+        total_value_wei += tx["value"]
+
+    receivers_only = sum(1 for address in receiver_addresses if address not in sender_addresses)
+
     # Compile block data
     block_data = {
         "block_number": latest_block.number,
         "timestamp": datetime.fromtimestamp(latest_block.timestamp).strftime('%Y-%m-%d %H:%M:%S'),
         "hash": latest_block.hash.hex(),
         "transactions_count": len(latest_block.transactions),
-        "total_value_transferred": float(total_value_eth),
+        "total_value_transferred": float(Web3.from_wei(total_value_wei, 'ether')),
         "address_summary": {
             "unique_senders": list(sender_addresses),
             "unique_receivers": list(receiver_addresses),
-            "total_unique_addresses": len(sender_addresses.union(receiver_addresses))
+            "total_unique_addresses": len(sender_addresses) + receivers_only
         }
     }
     
-    return block_data
\ No newline at end of file
+    return block_data
+
+def iter_block_transactions(block: Any, offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield transaction detail for a block, starting at `offset` and stopping after `limit` records.
+    """
+    transactions = block.transactions
+    end = len(transactions) if limit is None else min(len(transactions), offset + limit)
+
+    for index in range(max(offset, 0), end):
+        tx = transactions[index]
+        yield {
+            "hash": Web3.to_hex(tx["hash"]),
+            "from": tx["from"],
+            "to": tx["to"] if tx["to"] else "Contract Creation",
+            "value": float(Web3.from_wei(tx["value"], 'ether')),
+            "gas_price": float(Web3.from_wei(tx["gasPrice"], 'gwei')) if "gasPrice" in tx else None,
+            "gas": tx["gas"]
+        }
+
+# Shared follower that keeps recent Base Sepolia block summaries in memory
+block_follower = BlockHeadFollower(
+    constants.BASE_SEPOLIA_RPC_URL,
+    summarize_block,
+    history_size=constants.BLOCK_HISTORY_SIZE,
+    poll_interval=constants.BLOCK_POLL_INTERVAL_SECONDS,
+    stale_after=constants.BLOCK_STALE_SECONDS,
+    idle_timeout=constants.BLOCK_FOLLOWER_IDLE_SECONDS
+)
+
+def get_latest_block(
+    include_transactions: bool = False,
+    tx_offset: int = 0,
+    tx_limit: int = 25,
+    max_addresses: Optional[int] = None,
+    block_number: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get real time block data from the Base Sepolia network, including all addresses involved in transactions
+    and total value transferred.
+    
+    This function MUST be called every time in order to receive the latest block information.
+
+    To page through a block's transactions, pass back the `block_number` and `next_tx_offset` of the
+    previous result; without `block_number` each call describes whatever block is newest by then.
+
+    Args:
+        include_transactions (bool, optional): Include a page of per-transaction detail. Defaults to False.
+        tx_offset (int, optional): Index of the first transaction in the page. Defaults to 0.
+        tx_limit (int, optional): Maximum number of transactions in the page. Defaults to 25.
+        max_addresses (int, optional): Cap on the unique sender and receiver lists. Defaults to no cap.
+        block_number (int, optional): Block to describe, from a previous result. Defaults to the latest block.
+    """
+    block_follower.start()
+
+    if block_number is None:
+        # Answer from the follower's buffer; only fetch the head inline if it has fallen behind
+        block_data = block_follower.latest()
+        if block_data is None:
+            block_data = block_follower.refresh(backfill=False)
+    else:
+        block_data = block_follower.summary(block_number)
+        if block_data is None:
+            return {
+                "block_number": block_number,
+                "error": f"Block {block_number} is not among the {constants.BLOCK_HISTORY_SIZE} most recent blocks; "
+                         "call again without block_number for the latest block"
+            }
+
+    block_data = dict(block_data)
+
+    if max_addresses is not None:
+        address_summary = dict(block_data["address_summary"])
+        address_summary["unique_senders"] = address_summary["unique_senders"][:max_addresses]
+        address_summary["unique_receivers"] = address_summary["unique_receivers"][:max_addresses]
+        block_data["address_summary"] = address_summary
+
+    if include_transactions:
+        # Older blocks of the buffer are fetched once and kept while they are being paged
+        block = block_follower.page_block(block_data["block_number"])
+
+        tx_offset = max(tx_offset, 0)
+        transactions = list(iter_block_transactions(block, tx_offset, tx_limit))
+        next_offset = tx_offset + len(transactions)
+        block_data["transactions"] = transactions
+        block_data["next_tx_offset"] = next_offset if next_offset < block_data["transactions_count"] else None
+
+    return block_data
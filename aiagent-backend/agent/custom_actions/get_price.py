@@ -1,17 +1,113 @@
-from web3 import Web3
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 import os
 import json
+import re
+import time
+import threading
 import dotenv
+import constants
+from chain.provider import get_web3
 # from pythclient.pythclient import PythClient
 import asyncio
 
 dotenv.load_dotenv()
 
-def get_price_from_pyth(price_feed_id: str, max_age_seconds: int, pyth_contract_address:str = '0x8250f4aF4B972684F7b336503E2D6dFeDeB1487a', web3_provider_url: str = 'https://mainnet.base.org') -> Dict[str, Any]:
+# Load the Pyth contract ABI once at import instead of on every call
+with open(os.path.join(os.path.dirname(__file__), 'pyth_abi.json'), 'r') as abi_file:
+    PYTH_ABI = json.load(abi_file)
+
+PYTH_CONTRACT_ADDRESS = '0x8250f4aF4B972684F7b336503E2D6dFeDeB1487a'
+
+# Multicall3 is deployed at the same address on Base and most EVM chains
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+MULTICALL3_ABI = [{
+    "inputs": [{"components": [
+        {"internalType": "address", "name": "target", "type": "address"},
+        {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+        {"internalType": "bytes", "name": "callData", "type": "bytes"}
+    ], "internalType": "struct Multicall3.Call3[]", "name": "calls", "type": "tuple[]"}],
+    "name": "aggregate3",
+    "outputs": [{"components": [
+        {"internalType": "bool", "name": "success", "type": "bool"},
+        {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+    ], "internalType": "struct Multicall3.Result[]", "name": "returnData", "type": "tuple[]"}],
+    "stateMutability": "payable",
+    "type": "function"
+}]
+
+# Revert selectors raised by the Pyth contract
+PYTH_ERRORS = {
+    '19abf40e': 'StalePrice',
+    '14aebe68': 'PriceFeedNotFound',
+    'a9cb9e0d': 'InvalidArgument'
+}
+
+PRICE_TYPE = '(int64,uint64,int32,uint256)'
+
+FEED_ID_PATTERN = re.compile(r'0x[0-9a-f]{64}')
+
+# Contract bindings keyed by (web3_provider_url, pyth_contract_address)
+_contracts: Dict[Tuple[str, str], Any] = {}
+
+# Last price read for each (web3_provider_url, pyth_contract_address, price_feed_id)
+_price_cache: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+_price_cache_lock = threading.Lock()
+
+def _normalize_feed_id(price_feed_id: str) -> str:
+    """Return the feed id as lowercase hex with a 0x prefix."""
+    feed_id = price_feed_id.lower()
+    return feed_id if feed_id.startswith('0x') else f'0x{feed_id}'
+
+def get_pyth_contract(pyth_contract_address: str, web3_provider_url: str):
+    """
+    Return the cached Pyth contract binding for a contract address and RPC URL.
+    """
+    key = (web3_provider_url, pyth_contract_address)
+    contract = _contracts.get(key)
+    if contract is None:
+        w3 = get_web3(web3_provider_url)
+        contract = w3.eth.contract(address=pyth_contract_address, abi=PYTH_ABI)
+        _contracts[key] = contract
+    return contract
+
+def get_cached_price(price_feed_id: str, max_age_seconds: int, pyth_contract_address: str, web3_provider_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached price for a feed if its publishTime is within max_age_seconds, else None.
+    """
+    key = (web3_provider_url, pyth_contract_address, _normalize_feed_id(price_feed_id))
+    with _price_cache_lock:
+        cached = _price_cache.get(key)
+    if cached and time.time() - cached['publishTime'] <= max_age_seconds:
+        return dict(cached)
+    return None
+
+def cache_price(price_feed_id: str, price_data: Dict[str, Any], pyth_contract_address: str, web3_provider_url: str) -> None:
+    """
+    Store a price read, keeping whichever of the cached and new reads was published last.
+    """
+    key = (web3_provider_url, pyth_contract_address, _normalize_feed_id(price_feed_id))
+    with _price_cache_lock:
+        cached = _price_cache.get(key)
+        if not cached or cached['publishTime'] <= price_data['publishTime']:
+            _price_cache[key] = dict(price_data)
+
+def clear_cache() -> None:
+    """
+    Forget every cached price read, so the next read goes to the contract.
+    """
+    with _price_cache_lock:
+        _price_cache.clear()
+
+# Bind the default Base mainnet contract up front; this makes no network calls
+get_pyth_contract(PYTH_CONTRACT_ADDRESS, constants.BASE_MAINNET_RPC_URL)
+
+def get_price_from_pyth(price_feed_id: str, max_age_seconds: int, pyth_contract_address:str = PYTH_CONTRACT_ADDRESS, web3_provider_url: str = constants.BASE_MAINNET_RPC_URL) -> Dict[str, Any]:
     """
     Fetch the latest price from the Pyth contract using getPriceNoOlderThan.
 
+    A previously read price for the same feed is returned without an RPC call
+    while its publishTime is still within max_age_seconds.
+
     Args:
         price_feed_id (str): The ID of the price feed to read.
         max_age_seconds (int): Maximum age of the on-chain price in seconds.
@@ -19,25 +115,14 @@ def get_price_from_pyth(price_feed_id: str, max_age_seconds: int, pyth_contract_
     Returns:
         Dict[str, Any]: A dictionary containing price, conf, expo, and publishTime.
     """
-    w3 = Web3(Web3.HTTPProvider(web3_provider_url))
+    cached = get_cached_price(price_feed_id, max_age_seconds, pyth_contract_address, web3_provider_url)
+    if cached:
+        return cached
 
-    # Check connection
-    if not w3.is_connected():
-        raise ConnectionError("Failed to connect to the network.")
-
-    network_id = w3.eth.chain_id
-    print(f"Connected to network ID: {network_id}")
-
-    # Load the Pyth contract ABI
-    abi_path = os.path.join(os.path.dirname(__file__), 'pyth_abi.json')
-    with open(abi_path, 'r') as abi_file:
-        pyth_abi = json.load(abi_file)
-
-    # Instantiate the Pyth contract
-    pyth_contract = w3.eth.contract(address=pyth_contract_address, abi=pyth_abi)
+    pyth_contract = get_pyth_contract(pyth_contract_address, web3_provider_url)
 
     # Convert price_feed_id to bytes32
-    price_feed_id_bytes = bytes.fromhex(price_feed_id[2:])  # Remove '0x' prefix if present
+    price_feed_id_bytes = bytes.fromhex(_normalize_feed_id(price_feed_id)[2:])
 
     # Call getPriceNoOlderThan
     result = pyth_contract.functions.getPriceNoOlderThan(price_feed_id_bytes, max_age_seconds).call()
@@ -47,12 +132,15 @@ def get_price_from_pyth(price_feed_id: str, max_age_seconds: int, pyth_contract_
     expo = result[2]
     publishTime = result[3]
 
-    return {
+    price_data = {
         'price': price,
         'conf': conf,
         'expo': expo,
         'publishTime': publishTime
     }
+    cache_price(price_feed_id, price_data, pyth_contract_address, web3_provider_url)
+
+    return price_data
 
     # async def fetch_price():
     #     async with PythClient() as client:
@@ -69,6 +157,82 @@ def get_price_from_pyth(price_feed_id: str, max_age_seconds: int, pyth_contract_
     #         }
     # return asyncio.run(fetch_price())
 
+def get_prices_from_pyth(price_feed_ids: List[str], max_age_seconds: int, pyth_contract_address: str = PYTH_CONTRACT_ADDRESS, web3_provider_url: str = constants.BASE_MAINNET_RPC_URL) -> Dict[str, Any]:
+    """
+    Fetch the latest prices for several Pyth price feeds in a single RPC call.
+
+    Use this instead of calling get_price_from_pyth once per feed. Feeds are read
+    through one Multicall3 aggregate3 call; a feed that is stale or not found gets
+    an error entry without affecting the others.
+
+    Args:
+        price_feed_ids (List[str]): The IDs of the price feeds to read.
+        max_age_seconds (int): Maximum age of the on-chain prices in seconds.
+
+    Returns:
+        Dict[str, Any]: A map from each price feed ID as passed to either price, conf,
+        expo and publishTime, or an error describing why that feed could not be read.
+    """
+    feed_ids = {price_feed_id: _normalize_feed_id(price_feed_id) for price_feed_id in price_feed_ids}
+    results: Dict[str, Any] = {}
+    pending: List[str] = []
+
+    for feed_id in feed_ids.values():
+        if feed_id in results or feed_id in pending:
+            continue
+        if not FEED_ID_PATTERN.fullmatch(feed_id):
+            results[feed_id] = {'error': 'InvalidFeedId'}
+            continue
+        cached = get_cached_price(feed_id, max_age_seconds, pyth_contract_address, web3_provider_url)
+        if cached:
+            results[feed_id] = cached
+        else:
+            pending.append(feed_id)
+
+    if pending:
+        _read_prices(pending, max_age_seconds, pyth_contract_address, web3_provider_url, results)
+
+    return {price_feed_id: results[feed_id] for price_feed_id, feed_id in feed_ids.items()}
+
+def _read_prices(feed_ids: List[str], max_age_seconds: int, pyth_contract_address: str, web3_provider_url: str, results: Dict[str, Any]) -> None:
+    """
+    Read several normalized feed ids through one aggregate3 call, storing each
+    feed's price or error in results.
+    """
+    w3 = get_web3(web3_provider_url)
+    pyth_contract = get_pyth_contract(pyth_contract_address, web3_provider_url)
+    multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+
+    calls = []
+    for feed_id in feed_ids:
+        call_data = pyth_contract.encode_abi(
+            "getPriceNoOlderThan",
+            args=[bytes.fromhex(feed_id[2:]), max_age_seconds]
+        )
+        calls.append((pyth_contract.address, True, call_data))
+
+    responses = multicall.functions.aggregate3(calls).call()
+
+    for feed_id, (success, return_data) in zip(feed_ids, responses):
+        if not success:
+            selector = bytes(return_data[:4]).hex()
+            results[feed_id] = {'error': PYTH_ERRORS.get(selector, 'CallReverted')}
+            continue
+
+        try:
+            price, conf, expo, publishTime = w3.codec.decode([PRICE_TYPE], return_data)[0]
+        except Exception:
+            results[feed_id] = {'error': 'InvalidResponse'}
+            continue
+        price_data = {
+            'price': price,
+            'conf': conf,
+            'expo': expo,
+            'publishTime': publishTime
+        }
+        cache_price(feed_id, price_data, pyth_contract_address, web3_provider_url)
+        results[feed_id] = price_data
+
 if __name__ == "__main__":
     # Example usage
     price_feed_id = "0x2817d7bfe5c64b8ea956e9a26f573ef64e72e4d7891f2d6af9bcc93f7aff9a97"  # Example price feed ID
@@ -1,8 +1,8 @@
-from typing import Any, Dict
-from oneinch.client import OneInchClient
+import logging
+from typing import Any, Dict, Optional
+from oneinch.client import get_client
 
-# Initialize OneInchClient
-client = OneInchClient()
+logger = logging.getLogger(__name__)
 
 def swap_tokens(token_in_address: str, token_out_address: str, amount_in_wei: int, slippage: float = 100) -> Dict[str, Any]:
     """
@@ -18,10 +18,10 @@ def swap_tokens(token_in_address: str, token_out_address: str, amount_in_wei: in
         Dict[str, Any]: The swap transaction result or empty dict if failed
     """
     try:
-        result = client.swap_tokens(token_in_address, token_out_address, amount_in_wei, slippage)
+        result = get_client().swap_tokens(token_in_address, token_out_address, amount_in_wei, slippage)
         return result if result else {}
     except Exception as e:
-        print(f"Error in swap_tokens: {e}")
+        logger.error("Error in swap_tokens: %s", e)
         return {}
 
 def fetch_quote(src_chain: int, dst_chain: int, from_token: str, to_token: str, amount: int) -> Dict[str, Any]:
@@ -29,7 +29,7 @@ def fetch_quote(src_chain: int, dst_chain: int, from_token: str, to_token: str,
     Fetch a quote for a token swap from 1inch.
     """
     try:
-        quote = client.get_quote(
+        quote = get_client().get_quote(
             src_chain=src_chain,
             dst_chain=dst_chain,
             from_token=from_token,
@@ -38,19 +38,24 @@ def fetch_quote(src_chain: int, dst_chain: int, from_token: str, to_token: str,
         )
         return quote if quote else {}
     except Exception as e:
-        print(f"Error in fetch_quote: {e}")
+        logger.error("Error in fetch_quote: %s", e)
         return {}
 
-def fetch_active_orders() -> Dict[str, Any]:
+def fetch_active_orders(since: Optional[str] = None) -> Dict[str, Any]:
     """
-    Fetch active orders from 1inch Fusion Plus.
+    Fetch active orders from 1inch Fusion Plus, together with a cursor. Pass the cursor back
+    as `since` to get only the orders added, changed or removed after that call.
+
+    Args:
+        since (str, optional): Cursor returned by a previous call in this conversation. Without
+            one, every active order is listed; `full_listing` in the result says when that happened.
 
     Returns:
         Dict[str, Any]: Active orders information or empty dict if failed
     """
     try:
-        orders = client.fetch_active_orders()
+        orders = get_client().fetch_active_orders(since)
         return orders if orders else {}
     except Exception as e:
-        print(f"Error in fetch_active_orders: {e}")
+        logger.error("Error in fetch_active_orders: %s", e)
         return {}
@@ -1,93 +1,123 @@
+import logging
 import re
 import json
+from typing import Any, Callable, Dict, Optional
 import constants
 from db.tokens import add_token
 from db.nfts import add_nft
-from oneinch.actions import (
-    swap_tokens,
-    get_quote as fetch_quote,
-    fetch_active_orders
-)
-from agent.custom_actions.get_price import get_price_from_pyth
-
-def handle_agent_action(agent_action: str, content: str) -> None:
+
+logger = logging.getLogger(__name__)
+
+PostToolHandler = Callable[[Any], Optional[bool]]
+
+# Post-tool handlers keyed by tool name. Each receives the tool's parsed result and
+# must not call the upstream service again: the tool has already done that work.
+# A handler returns False (or raises) when its side effect did not happen.
+POST_TOOL_HANDLERS: Dict[str, PostToolHandler] = {}
+
+ADDRESS_PATTERN = re.compile(r'0x[a-fA-F0-9]{40}')
+
+def post_tool_handler(tool_name: str) -> Callable[[PostToolHandler], PostToolHandler]:
+    """
+    Register a function as the post-tool handler for a tool name.
+    """
+    def register(handler: PostToolHandler) -> PostToolHandler:
+        POST_TOOL_HANDLERS[tool_name] = handler
+        return handler
+    return register
+
+def parse_tool_result(content: Any) -> Any:
+    """
+    Parse a tool result once: JSON strings become objects, anything else is returned unchanged.
+    """
+    if not isinstance(content, str):
+        return content
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content
+
+def extract_address(result: Any) -> Optional[str]:
+    """
+    Return the first contract address mentioned in a tool result.
+    """
+    match = ADDRESS_PATTERN.search(result if isinstance(result, str) else json.dumps(result))
+    return match.group() if match else None
+
+@post_tool_handler(constants.DEPLOY_TOKEN)
+def record_token_deployment(result: Any) -> bool:
+    address = extract_address(result)
+    if not address:
+        logger.warning("No contract address in %s result", constants.DEPLOY_TOKEN)
+        return False
+    return add_token(address)
+
+@post_tool_handler(constants.DEPLOY_NFT)
+def record_nft_deployment(result: Any) -> bool:
+    address = extract_address(result)
+    if not address:
+        logger.warning("No contract address in %s result", constants.DEPLOY_NFT)
+        return False
+    return add_nft(address)
+
+@post_tool_handler(constants.FETCH_ACTIVE_ORDERS)
+def report_active_orders(result: Any) -> None:
+    if isinstance(result, dict):
+        logger.info("Active orders: %s total, %d added, %d changed, %d removed", result.get('total'),
+                    len(result.get('added', [])), len(result.get('changed', [])), len(result.get('removed', [])))
+
+@post_tool_handler(constants.SWAP_TOKENS)
+def report_swap(result: Any) -> None:
+    logger.info("Swap result: %s", result)
+
+@post_tool_handler(constants.FETCH_QUOTE)
+def report_quote(result: Any) -> None:
+    logger.info("Quote: %s", result.get('quoteId') if isinstance(result, dict) else result)
+
+@post_tool_handler(constants.GET_PRICE)
+def report_price(result: Any) -> None:
+    if isinstance(result, dict):
+        logger.info("Price: %se%s, confidence: %s, publish time: %s", result.get('price'), result.get('expo'),
+                    result.get('conf'), result.get('publishTime'))
+
+@post_tool_handler(constants.GET_PRICES)
+def report_prices(result: Any) -> None:
+    if isinstance(result, dict):
+        for price_feed_id, price_data in result.items():
+            if 'error' in price_data:
+                logger.info("Price %s: %s", price_feed_id, price_data['error'])
+            else:
+                logger.info("Price %s: %se%s", price_feed_id, price_data.get('price'), price_data.get('expo'))
+
+def handle_agent_action(agent_action: str, content: Any) -> bool:
     """
     Handle various agent actions including token/NFT deployments and DeFi operations.
 
-    This function processes different types of agent actions and performs the corresponding
-    operations such as token deployments, NFT deployments, 1inch trades, and price queries.
+    This function looks up the post-tool handler registered for the tool that produced
+    the result and passes it the parsed result. Handlers only act on that result, such
+    as saving deployed contract addresses, and never repeat the tool's upstream calls.
 
     Args:
-        agent_action (str): The type of action to be performed (e.g., DEPLOY_TOKEN, SWAP_TOKENS)
-        content (str): The content/parameters required for the action, usually in JSON format
+        agent_action (str): The name of the tool that ran (e.g., DEPLOY_TOKEN, SWAP_TOKENS)
+        content (Any): The tool's output, either a string (usually JSON) or an already parsed object
+
+    Returns:
+        bool: False if the action's side effect failed, True otherwise (including tools without a handler)
 
     Actions supported:
-        - DEPLOY_TOKEN: Deploy a new token contract
-        - DEPLOY_NFT: Deploy a new NFT contract
-        - FETCH_ACTIVE_ORDERS: Get active orders from 1inch
-        - SWAP_TOKENS: Execute a token swap on 1inch
-        - FETCH_QUOTE: Get a quote for a token swap
-        - GET_PRICE: Get price data from Pyth Network
+        - DEPLOY_TOKEN: Record a deployed token contract
+        - DEPLOY_NFT: Record a deployed NFT contract
+        - FETCH_ACTIVE_ORDERS: Report active order changes from 1inch
+        - SWAP_TOKENS: Report a token swap result from 1inch
+        - FETCH_QUOTE: Report a 1inch swap quote
+        - GET_PRICE, GET_PRICES: Report price data from Pyth Network
     """
-    if agent_action == constants.DEPLOY_TOKEN:
-        try:
-            address = re.search(r'0x[a-fA-F0-9]{40}', content).group()
-            add_token(address)
-        except Exception as e:
-            print(f"Error deploying token: {e}")
-
-    if agent_action == constants.DEPLOY_NFT:
-        try:
-            address = re.search(r'0x[a-fA-F0-9]{40}', content).group()
-            add_nft(address)
-        except Exception as e:
-            print(f"Error deploying NFT: {e}")
-
-    if agent_action == constants.FETCH_ACTIVE_ORDERS:
-        try:
-            orders = fetch_active_orders()
-            print("Active orders:", orders)
-        except Exception as e:
-            print(f"Error fetching active orders: {e}")
-
-    if agent_action == constants.SWAP_TOKENS:
-        try:
-            params = json.loads(content)
-            result = swap_tokens(
-                token_in_address=params.get('from_token'),
-                token_out_address=params.get('to_token'),
-                amount_in_wei=int(params.get('amount')),
-                slippage=float(params.get('slippage', 100))
-            )
-            print("Swap result:", result)
-        except Exception as e:
-            print(f"Error swapping tokens: {e}")
-
-    if agent_action == constants.FETCH_QUOTE:
-        try:
-            params = json.loads(content)
-            quote = fetch_quote(
-                src_chain=int(params.get('src_chain')),
-                dst_chain=int(params.get('dst_chain')),
-                from_token=params.get('from_token'),
-                to_token=params.get('to_token'),
-                amount=int(params.get('amount'))
-            )
-            print("Quote:", quote)
-        except Exception as e:
-            print(f"Error fetching quote: {e}")
-
-    if agent_action == constants.GET_PRICE:
-        try:
-            params = json.loads(content)
-            price_data = get_price_from_pyth(
-                price_feed_id=params.get('price_feed_id'),
-                max_age_seconds=int(params.get('max_age_seconds', 600)),
-                pyth_contract_address=params.get('pyth_contract_address', '0x8250f4aF4B972684F7b336503E2D6dFeDeB1487a'),
-                web3_provider_url=params.get('web3_provider_url', 'https://mainnet.base.org')
-            )
-            print(f"Price: {price_data.get('price')}e{price_data.get('expo')}")
-            print(f"Confidence: {price_data.get('conf')}")
-            print(f"Publish Time: {price_data.get('publishTime')}")
-        except Exception as e:
-            print(f"Error fetching price data: {e}")
+    handler = POST_TOOL_HANDLERS.get(agent_action)
+    if handler is None:
+        return True
+
+    try:
+        return handler(parse_tool_result(content)) is not False
+    except Exception as e:
+        logger.error("Error handling %s: %s", agent_action, e)
+        return False
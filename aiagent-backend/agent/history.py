@@ -0,0 +1,127 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+def estimate_tokens(message: BaseMessage) -> int:
+    """Cheap token estimate: about four characters per token plus per-message overhead."""
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    size = len(content)
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        size += len(tool_call["name"]) + len(json.dumps(tool_call["args"]))
+    return size // 4 + 4
+
+def _shorten(text: Any, limit: int) -> str:
+    text = text if isinstance(text, str) else json.dumps(text)
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+class HistoryTrimmer:
+    """
+    Build the model input for each agent step within a token budget.
+
+    The newest turns are sent verbatim, always starting at a user message so tool
+    results stay paired with the calls that produced them. Older messages are
+    collapsed into one compact summary line each (tool outputs included). Summary
+    lines are cached per thread and only extended with newly collapsed messages,
+    and the summary keeps its newest lines within `summary_budget` tokens.
+
+    The full history is still stored by the checkpointer; only the model input is trimmed.
+    """
+
+    def __init__(
+        self,
+        prompt: str,
+        token_budget: int = 6000,
+        summary_budget: int = 1000,
+        line_chars: int = 200,
+        cache_size: int = 256
+    ):
+        self.prompt = SystemMessage(content=prompt)
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.line_chars = line_chars
+        self.cache_size = cache_size
+
+        # thread_id -> (id of the first message, number of messages summarized, summary lines)
+        self._summaries: "OrderedDict[Any, Tuple[Optional[str], int, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build_model_input(self, state: Dict[str, Any], config: RunnableConfig) -> List[BaseMessage]:
+        """
+        Return the prompt, the summary of older turns and the recent turns for one model call.
+        """
+        messages: List[BaseMessage] = state["messages"]
+        thread_id = config.get("configurable", {}).get("thread_id")
+
+        split = self._split(messages)
+        summary = self._summary(thread_id, messages, split)
+
+        model_input: List[BaseMessage] = [self.prompt]
+        if summary:
+            model_input.append(SystemMessage(content="Summary of the earlier conversation:\n" + summary))
+        return model_input + messages[split:]
+
+    def _split(self, messages: List[BaseMessage]) -> int:
+        """Index of the oldest user message whose turns still fit the verbatim budget."""
+        budget = self.token_budget - estimate_tokens(self.prompt) - self.summary_budget
+        split = len(messages)
+        used = 0
+        for index in range(len(messages) - 1, -1, -1):
+            used += estimate_tokens(messages[index])
+            if isinstance(messages[index], HumanMessage):
+                # Always keep the latest user turn, even if it alone exceeds the budget
+                if used > budget and split < len(messages):
+                    break
+                split = index
+        return split if split < len(messages) else 0
+
+    def _summary(self, thread_id: Any, messages: List[BaseMessage], split: int) -> str:
+        if split == 0:
+            return ""
+
+        first_id = messages[0].id
+        with self._lock:
+            cached = self._summaries.get(thread_id)
+
+        # Reuse the cached lines when they describe a prefix of this history
+        if cached and cached[0] == first_id and cached[1] <= split:
+            lines = cached[2] + [self._line(message) for message in messages[cached[1]:split]]
+        else:
+            lines = [self._line(message) for message in messages[:split]]
+        lines = [line for line in lines if line]
+
+        with self._lock:
+            self._summaries[thread_id] = (first_id, split, lines)
+            self._summaries.move_to_end(thread_id)
+            while len(self._summaries) > self.cache_size:
+                self._summaries.popitem(last=False)
+
+        # Keep the newest lines that fit the summary budget
+        kept, used = [], 0
+        for line in reversed(lines):
+            used += len(line) // 4 + 1
+            if used > self.summary_budget:
+                break
+            kept.append(line)
+        return "\n".join(reversed(kept))
+
+    def _line(self, message: BaseMessage) -> str:
+        """One compact summary line for a message."""
+        if isinstance(message, HumanMessage):
+            return f"User: {_shorten(message.content, self.line_chars)}"
+        if isinstance(message, ToolMessage):
+            return f"Tool {message.name} returned: {_shorten(message.content, self.line_chars)}"
+        if isinstance(message, AIMessage):
+            calls = ", ".join(
+                f"{tool_call['name']}({_shorten(tool_call['args'], self.line_chars // 2)})"
+                for tool_call in message.tool_calls
+            )
+            text = _shorten(message.content, self.line_chars) if message.content else ""
+            if calls:
+                return f"Assistant called {calls}" + (f" and said: {text}" if text else "")
+            return f"Assistant: {text}" if text else ""
+        return ""
@@ -1,19 +1,27 @@
 import os
 import json
+import logging
+from typing import Any, List
 import constants
 
 from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 
 from cdp_langchain.agent_toolkits import CdpToolkit
 from cdp_langchain.utils import CdpAgentkitWrapper
 
 from db.wallet import add_wallet_info, get_wallet_info
+from agent.checkpointer import SqliteCheckpointSaver
+from agent.history import HistoryTrimmer
+from agent.tool_execution import prepare_tools
+from agent.tool_output import compact_tool, get_full_tool_result
+from telemetry import add_secret
 from agent.custom_actions.get_latest_block import get_latest_block
-from agent.custom_actions.get_price import get_price_from_pyth
+from agent.custom_actions.get_block_range_stats import get_block_range_stats
+from agent.custom_actions.get_price import get_price_from_pyth, get_prices_from_pyth
 from agent.custom_actions.oneinch_fusion_plus import swap_tokens, fetch_quote, fetch_active_orders
 
+logger = logging.getLogger(__name__)
 
 def initialize_agent():
     """Initialize the agent with CDP Agentkit."""
@@ -23,7 +31,8 @@ def initialize_agent():
     # Read wallet data from environment variable or database
     wallet_id = os.getenv(constants.WALLET_ID_ENV_VAR)
     wallet_seed = os.getenv(constants.WALLET_SEED_ENV_VAR)
-    wallet_info = json.loads(get_wallet_info()) if get_wallet_info() else None
+    stored_wallet_info = get_wallet_info()
+    wallet_info = json.loads(stored_wallet_info) if stored_wallet_info else None
 
     # Configure CDP Agentkit Langchain Extension.
     values = {}
@@ -32,10 +41,12 @@ def initialize_agent():
     if wallet_info:
         wallet_id = wallet_info["wallet_id"]
         wallet_seed = wallet_info["seed"]
-        print("Initialized CDP Agentkit with wallet data from database:", wallet_id, wallet_seed, flush=True)
+        add_secret(wallet_seed)
+        logger.info("Initialized CDP Agentkit with wallet data from database: %s", wallet_id)
         values = {"cdp_wallet_data": json.dumps({ "wallet_id": wallet_id, "seed": wallet_seed })}
     elif wallet_id and wallet_seed:
-        print("Initialized CDP Agentkit with wallet data from environment:", wallet_id, wallet_seed, flush=True)
+        add_secret(wallet_seed)
+        logger.info("Initialized CDP Agentkit with wallet data from environment: %s", wallet_id)
         values = {"cdp_wallet_data": json.dumps({ "wallet_id": wallet_id, "seed": wallet_seed })}
 
     agentkit = CdpAgentkitWrapper(**values)
@@ -43,27 +54,68 @@ def initialize_agent():
     # Export and store the updated wallet data back to environment variable
     wallet_data = agentkit.export_wallet()
     add_wallet_info(json.dumps(wallet_data))
-    print("Exported wallet info", wallet_data, flush=True)
+    exported = json.loads(wallet_data) if isinstance(wallet_data, str) else wallet_data
+    # Never log the seed; mask it anywhere it might still show up
+    add_secret(exported.get("seed"))
+    logger.info("Exported wallet info for wallet %s", exported.get("wallet_id"))
 
     # Initialize CDP Agentkit Toolkit and get tools.
     cdp_toolkit = CdpToolkit.from_cdp_agentkit_wrapper(agentkit)
-    tools = cdp_toolkit.get_tools() + [
+    toolkit_tools = cdp_toolkit.get_tools()
+
+    # A renamed toolkit tool would no longer be classified as read-only
+    missing = constants.CDP_READ_ONLY_TOOLS - {tool.name for tool in toolkit_tools}
+    if missing:
+        logger.warning("CDP toolkit has no %s tools; calls to renamed tools are serialized as state-changing",
+                       ", ".join(sorted(missing)))
+    return build_agent(llm, toolkit_tools)
+
+def build_agent(llm, toolkit_tools: List[Any]):
+    """
+    Create the ReAct agent around an LLM, with the custom tools added to the toolkit tools.
+
+    Args:
+        llm: Chat model supporting tool calling.
+        toolkit_tools (List[Any]): Tools from the CDP toolkit, or any other tools to offer.
+
+    Returns:
+        The compiled agent graph.
+    """
+    # Custom tools send the model a compact result; the full result is kept as the
+    # message artifact and can be looked up with get_full_tool_result.
+    tools = prepare_tools(toolkit_tools + [compact_tool(tool) for tool in [
         get_latest_block,
+        get_block_range_stats,
 
         fetch_quote,
         fetch_active_orders,
         swap_tokens,
 
         get_price_from_pyth,
-    ]
+        get_prices_from_pyth,
+    ]] + [get_full_tool_result])
 
-    # Store buffered conversation history in memory.
-    memory = MemorySaver()
+    # Persist conversation history in SQLite, keeping recently active threads in memory.
+    memory = SqliteCheckpointSaver(
+        cache_size=constants.CHECKPOINT_CACHE_SIZE,
+        idle_seconds=constants.CHECKPOINT_IDLE_SECONDS,
+        ttl_seconds=constants.CHECKPOINT_TTL_SECONDS,
+        prune_interval=constants.CHECKPOINT_PRUNE_INTERVAL_SECONDS,
+        keep_checkpoints=constants.CHECKPOINT_KEEP_PER_THREAD
+    )
+
+    # Trim each step's model input to the token budget, summarizing older turns.
+    history_trimmer = HistoryTrimmer(
+        constants.AGENT_PROMPT,
+        token_budget=int(os.getenv(constants.HISTORY_TOKEN_BUDGET_ENV_VAR, constants.HISTORY_TOKEN_BUDGET)),
+        summary_budget=constants.HISTORY_SUMMARY_TOKENS,
+        line_chars=constants.HISTORY_SUMMARY_LINE_CHARS
+    )
 
     # Create ReAct Agent using the LLM and CDP Agentkit tools.
     return create_react_agent(
         llm,
         tools=tools,
         checkpointer=memory,
-        state_modifier=constants.AGENT_PROMPT,
+        state_modifier=history_trimmer.build_model_input,
     )
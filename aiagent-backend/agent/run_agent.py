@@ -1,24 +1,132 @@
-from typing import Iterator
-from langchain_core.messages import HumanMessage
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+from langchain_core.messages import AIMessageChunk, HumanMessage
 import constants
 from utils import format_sse
-from agent.handle_agent_action import handle_agent_action
+from agent.side_effects import action_queue
+from agent.tracing import tracing_handler
+from telemetry import conversation_context, registry, span
 
-def run_agent(input, agent_executor, config) -> Iterator[str]:
-    """Run the agent and yield formatted SSE messages"""
+FIRST_EVENT_SECONDS = registry.histogram(
+    "agent_chat_first_event_seconds",
+    "Time from the start of a chat turn to its first SSE event",
+    labels=("mode",)
+)
+CHAT_ERRORS = registry.counter("agent_chat_errors_total", "Chat turns that ended with an error event", labels=("mode",))
+
+def _traced_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the tracing callback handler to a run config"""
+    return {**config, "callbacks": [*(config.get("callbacks") or []), tracing_handler]}
+
+def _conversation_id(config: Dict[str, Any]) -> Any:
+    return config.get("configurable", {}).get("thread_id")
+
+def _format_update(chunk: Dict[str, Any], submit: Callable[[str, Any], Any]) -> Iterator[str]:
+    """Format one graph update as SSE messages and hand tool side effects to `submit`"""
+    if "agent" in chunk:
+        content = chunk["agent"]["messages"][0].content
+        if content:
+            yield format_sse(content, constants.EVENT_TYPE_AGENT)
+    elif "tools" in chunk:
+        for message in chunk["tools"]["messages"]:
+            if not message.content:
+                continue
+            # Compacted tools carry their full result as the artifact; the client and
+            # the side-effect handlers get the full result, the model the compact one.
+            artifact = getattr(message, "artifact", None)
+            if artifact is not None:
+                yield format_sse(json.dumps(artifact, default=str), constants.EVENT_TYPE_TOOLS, functions=[message.name])
+                submit(message.name, artifact)
+            else:
+                yield format_sse(message.content, constants.EVENT_TYPE_TOOLS, functions=[message.name])
+                # Side effects run on the write-behind worker so they never delay the stream
+                submit(message.name, message.content)
+
+def _format_stream_item(stream_mode: str, payload: Any, submit: Callable[[str, Any], Any]) -> Iterator[str]:
+    """
+    Format one item of a ["messages", "updates"] stream: token deltas from the agent
+    node become partial agent events, updates are formatted as usual.
+    """
+    if stream_mode != "messages":
+        yield from _format_update(payload, submit)
+        return
+
+    message, metadata = payload
+    if (
+        metadata.get("langgraph_node") == "agent"
+        and isinstance(message, AIMessageChunk)
+        and isinstance(message.content, str)
+        and message.content
+    ):
+        yield format_sse(message.content, constants.EVENT_TYPE_AGENT, partial=True)
+
+def run_agent(input, agent_executor, config, stream_tokens: bool = False) -> Iterator[str]:
+    """
+    Run the agent and yield formatted SSE messages.
+
+    With stream_tokens, model output is also streamed as it is generated: each token
+    delta is sent as a partial agent event, followed by the usual full agent event
+    once the message is complete.
+
+    The turn, its LLM steps and its tool calls are recorded as spans tagged with the
+    conversation id.
+    """
+    mode = "tokens" if stream_tokens else "updates"
+    with conversation_context(_conversation_id(config)), span("turn", mode):
+        start = time.perf_counter()
+        for index, message in enumerate(_run_agent(input, agent_executor, _traced_config(config), stream_tokens)):
+            if index == 0:
+                FIRST_EVENT_SECONDS.observe(time.perf_counter() - start, mode=mode)
+            yield message
+
+def _run_agent(input, agent_executor, config, stream_tokens: bool) -> Iterator[str]:
     try:
-        for chunk in agent_executor.stream(
-            {"messages": [HumanMessage(content=input)]}, config
+        if not stream_tokens:
+            for chunk in agent_executor.stream(
+                {"messages": [HumanMessage(content=input)]}, config
+            ):
+                yield from _format_update(chunk, action_queue.submit)
+            return
+
+        for stream_mode, payload in agent_executor.stream(
+            {"messages": [HumanMessage(content=input)]}, config, stream_mode=["messages", "updates"]
+        ):
+            yield from _format_stream_item(stream_mode, payload, action_queue.submit)
+    except Exception as e:
+        CHAT_ERRORS.inc(mode="tokens" if stream_tokens else "updates")
+        yield format_sse(f"Error: {str(e)}", constants.EVENT_TYPE_ERROR)
+
+async def arun_agent(input, agent_executor, config, stream_tokens: bool = False) -> AsyncIterator[str]:
+    """
+    Async counterpart of run_agent, driving the agent with astream on the event loop.
+    """
+    mode = "tokens" if stream_tokens else "updates"
+    with conversation_context(_conversation_id(config)), span("turn", mode):
+        start = time.perf_counter()
+        first = True
+        async for message in _arun_agent(input, agent_executor, _traced_config(config), stream_tokens):
+            if first:
+                FIRST_EVENT_SECONDS.observe(time.perf_counter() - start, mode=mode)
+                first = False
+            yield message
+
+async def _arun_agent(input, agent_executor, config, stream_tokens: bool) -> AsyncIterator[str]:
+    # Side effects are queued with submit_nowait so a full queue never blocks the event loop
+    try:
+        if not stream_tokens:
+            async for chunk in agent_executor.astream(
+                {"messages": [HumanMessage(content=input)]}, config
+            ):
+                for message in _format_update(chunk, action_queue.submit_nowait):
+                    yield message
+            return
+
+        async for stream_mode, payload in agent_executor.astream(
+            {"messages": [HumanMessage(content=input)]}, config, stream_mode=["messages", "updates"]
         ):
-            if "agent" in chunk:
-                content = chunk["agent"]["messages"][0].content
-                if content:
-                    yield format_sse(content, constants.EVENT_TYPE_AGENT)
-            elif "tools" in chunk:
-                name = chunk["tools"]["messages"][0].name
-                content = chunk["tools"]["messages"][0].content
-                if content:
-                    yield format_sse(content, constants.EVENT_TYPE_TOOLS, functions=[name])
-                    handle_agent_action(name, content)
+            for message in _format_stream_item(stream_mode, payload, action_queue.submit_nowait):
+                yield message
     except Exception as e:
+        CHAT_ERRORS.inc(mode="tokens" if stream_tokens else "updates")
         yield format_sse(f"Error: {str(e)}", constants.EVENT_TYPE_ERROR)
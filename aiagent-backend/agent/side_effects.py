@@ -0,0 +1,211 @@
+import logging
+import atexit
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import constants
+from db.storage import transaction
+from db.listing import invalidate
+from agent.handle_agent_action import handle_agent_action
+from telemetry import registry
+
+logger = logging.getLogger(__name__)
+
+# Actions whose side effects are DB inserts, mapped to the listing they change
+DB_ACTIONS: Dict[str, str] = {
+    constants.DEPLOY_TOKEN: "tokens",
+    constants.DEPLOY_NFT: "nfts",
+}
+
+class WriteBehindQueue:
+    """
+    Run agent action side effects on a background worker instead of the SSE stream.
+
+    Queued actions are drained in batches; DB inserts within a batch share a single
+    transaction. The handler returns False (or raises) for an action whose side effect
+    failed, which is counted in `failed`.
+
+    The queue is bounded: when it is full, submit() blocks the producer and the time
+    spent waiting is recorded in the backpressure metrics, while submit_nowait(), for
+    producers on an event loop, never blocks.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, str], bool],
+        db_actions: Dict[str, str],
+        maxsize: int = 1000,
+        batch_size: int = 50
+    ):
+        self.handler = handler
+        self.db_actions = db_actions
+        self.batch_size = batch_size
+
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue(maxsize=maxsize)
+        self._overflow: "deque[Tuple[str, str]]" = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+        self.overflowed = 0
+        self.dropped = 0
+
+    def submit(self, agent_action: str, content: str) -> None:
+        """Queue an action for the worker, blocking only while the queue is full."""
+        self._ensure_worker()
+        with self._lock:
+            self._pending += 1
+            self.enqueued += 1
+        try:
+            self._queue.put_nowait((agent_action, content))
+        except queue.Full:
+            started = time.monotonic()
+            self._queue.put((agent_action, content))
+            with self._lock:
+                self.blocked += 1
+                self.blocked_seconds += time.monotonic() - started
+        with self._lock:
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def submit_nowait(self, agent_action: str, content: str) -> bool:
+        """
+        Queue an action without ever blocking the caller.
+
+        When the queue is full, DB actions go to an overflow list that the worker drains
+        first, so no deployment is lost; other actions only report results and are dropped.
+
+        Returns:
+            bool: False if the action was dropped.
+        """
+        self._ensure_worker()
+        with self._lock:
+            self._pending += 1
+            self.enqueued += 1
+        try:
+            self._queue.put_nowait((agent_action, content))
+        except queue.Full:
+            if agent_action not in self.db_actions:
+                with self._idle:
+                    self._pending -= 1
+                    self.enqueued -= 1
+                    self.dropped += 1
+                    self._idle.notify_all()
+                logger.warning("Side effect queue full, dropped %s", agent_action,
+                               extra={"sample_rate": constants.LOG_ERROR_SAMPLE_RATE})
+                return False
+            with self._lock:
+                self._overflow.append((agent_action, content))
+                self.overflowed += 1
+        with self._lock:
+            self.max_depth = max(self.max_depth, self._queue.qsize() + len(self._overflow))
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued action has been handled. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, throughput and backpressure counters."""
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "max_depth": self.max_depth,
+                "capacity": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "processed": self.processed,
+                "failed": self.failed,
+                "batches": self.batches,
+                "blocked": self.blocked,
+                "blocked_seconds": self.blocked_seconds,
+                "overflowed": self.overflowed,
+                "dropped": self.dropped
+            }
+
+    def _ensure_worker(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="agent-side-effects", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            # Actions overflow only while the queue is full, so the get below cannot
+            # block until they have been drained here
+            with self._lock:
+                batch = [self._overflow.popleft() for _ in range(min(len(self._overflow), self.batch_size))]
+            if not batch:
+                batch.append(self._queue.get())
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            failed = self._process(batch)
+
+            with self._idle:
+                self.batches += 1
+                self.processed += len(batch) - failed
+                self.failed += failed
+                self._pending -= len(batch)
+                self._idle.notify_all()
+
+    def _process(self, batch: List[Tuple[str, str]]) -> int:
+        """Handle one batch and return the number of actions that failed."""
+        failed = 0
+        db_items = [item for item in batch if item[0] in self.db_actions]
+        other_items = [item for item in batch if item[0] not in self.db_actions]
+
+        if db_items:
+            try:
+                with transaction():
+                    for agent_action, content in db_items:
+                        # A failing action must not roll back the rest of the batch
+                        try:
+                            if not self.handler(agent_action, content):
+                                failed += 1
+                        except Exception as e:
+                            logger.error("Error handling agent action %s: %s", agent_action, e)
+                            failed += 1
+            except Exception as e:
+                logger.error("Error writing agent actions: %s", e)
+                failed = len(db_items)
+            # Invalidate again after commit so no reader caches pre-commit rows
+            for listing in {self.db_actions[action] for action, _ in db_items}:
+                invalidate(listing)
+
+        for agent_action, content in other_items:
+            try:
+                if not self.handler(agent_action, content):
+                    failed += 1
+            except Exception as e:
+                logger.error("Error handling agent action %s: %s", agent_action, e)
+                failed += 1
+
+        return failed
+
+# Shared queue used by run_agent
+action_queue = WriteBehindQueue(
+    handle_agent_action,
+    DB_ACTIONS,
+    maxsize=constants.SIDE_EFFECT_QUEUE_SIZE,
+    batch_size=constants.SIDE_EFFECT_BATCH_SIZE
+)
+
+# Drain pending side effects before the process exits
+atexit.register(action_queue.flush, constants.SIDE_EFFECT_FLUSH_TIMEOUT_SECONDS)
+registry.register_stats("agent_side_effects", action_queue.stats)
@@ -0,0 +1,85 @@
+import contextlib
+import functools
+import threading
+from typing import Any, Callable, ContextManager, Dict, Iterator, List
+
+import constants
+from telemetry import get_conversation_id
+
+class KeyedLock:
+    """
+    One lock per key, created on first use and dropped once nobody holds or waits on it.
+    With `slots` above 1, each key gets a semaphore letting that many holders in at once.
+    """
+
+    def __init__(self, slots: int = 1):
+        self.slots = slots
+        self._locks: Dict[Any, list] = {}
+        self._lock = threading.Lock()
+
+    def _new_lock(self) -> ContextManager:
+        return threading.Lock() if self.slots == 1 else threading.BoundedSemaphore(self.slots)
+
+    @contextlib.contextmanager
+    def hold(self, key: Any) -> Iterator[None]:
+        with self._lock:
+            # [lock, number of holders and waiters]
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [self._new_lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+# Read-only tool calls share a bounded number of slots per conversation, so a step
+# fanning out to many calls is limited without one conversation's calls waiting on
+# another's (or, on the async server, holding executor threads while they wait)
+_read_only_slots = KeyedLock(constants.TOOL_MAX_CONCURRENCY_PER_CONVERSATION)
+
+# State-changing tools (swaps, transfers, deployments) run one at a time within a
+# conversation, so one conversation's steps never race each other while a slow
+# transfer in one conversation doesn't hold up the others
+_state_changing_locks = KeyedLock()
+
+def _read_only_guard() -> ContextManager:
+    return _read_only_slots.hold(get_conversation_id())
+
+def _state_changing_guard() -> ContextManager:
+    return _state_changing_locks.hold(get_conversation_id())
+
+def _guard(func: Callable, guard: Callable[[], ContextManager]) -> Callable:
+    @functools.wraps(func)
+    def guarded(*args, **kwargs):
+        with guard():
+            return func(*args, **kwargs)
+    return guarded
+
+def prepare_tools(tools: List[Any]) -> List[Any]:
+    """
+    Prepare the agent's tools for concurrent execution within one agent step.
+
+    The ReAct tool node runs every tool call of a step in parallel and returns the
+    results in call order. Read-only tools (constants.READ_ONLY_TOOLS) are wrapped to
+    share a bounded number of concurrent slots per conversation; every other tool is
+    serialized per conversation. Plain functions are wrapped directly, and toolkit
+    tools are copied with their underlying `func` wrapped, so the shared tool objects
+    are left untouched.
+    """
+    prepared = []
+    for tool in tools:
+        name = getattr(tool, "name", None) or tool.__name__
+        guard = _read_only_guard if name in constants.READ_ONLY_TOOLS else _state_changing_guard
+
+        if getattr(tool, "func", None) is not None:
+            prepared.append(tool.model_copy(update={"func": _guard(tool.func, guard)}))
+        elif callable(tool) and not hasattr(tool, "name"):
+            prepared.append(_guard(tool, guard))
+        else:
+            prepared.append(tool)
+    return prepared
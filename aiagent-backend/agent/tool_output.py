@@ -0,0 +1,161 @@
+import functools
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from langchain_core.tools import StructuredTool
+
+import constants
+from telemetry import get_conversation_id
+
+Compactor = Callable[[Any], Any]
+
+# Per-tool compactors keyed by tool name, applied before the generic size limits
+COMPACTORS: Dict[str, Compactor] = {}
+
+class ToolResultStore:
+    """
+    Bounded in-memory store of full tool results, keyed by a short result id and
+    readable only from the conversation that produced them.
+
+    The store is not durable: results are lost on restart and evicted oldest first,
+    while the compacted messages carrying their ids are persisted by the checkpointer,
+    so an id from an earlier turn may no longer resolve.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        # result id -> (conversation id, result)
+        self._results: "OrderedDict[str, Tuple[Optional[str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, result: Any, conversation_id: Optional[str]) -> str:
+        result_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._results[result_id] = (conversation_id, result)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result_id
+
+    def get(self, result_id: str, conversation_id: Optional[str]) -> Optional[Any]:
+        """Return a stored result, or None if it is gone or belongs to another conversation."""
+        with self._lock:
+            entry = self._results.get(result_id)
+        if entry is None or entry[0] != conversation_id:
+            return None
+        return entry[1]
+
+tool_result_store = ToolResultStore(constants.TOOL_RESULT_STORE_SIZE)
+
+def compactor(tool_name: str) -> Callable[[Compactor], Compactor]:
+    """
+    Register a function that reduces a tool's result to the fields the model needs.
+    """
+    def register(func: Compactor) -> Compactor:
+        COMPACTORS[tool_name] = func
+        return func
+    return register
+
+def limit_size(value: Any, max_items: int = constants.TOOL_OUTPUT_MAX_LIST_ITEMS, max_chars: int = constants.TOOL_OUTPUT_MAX_STRING_CHARS) -> Any:
+    """
+    Recursively sample long lists and truncate long strings.
+    """
+    if isinstance(value, dict):
+        return {key: limit_size(item, max_items, max_chars) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [limit_size(item, max_items, max_chars) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more")
+        return items
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "..."
+    return value
+
+@compactor(constants.GET_LATEST_BLOCK)
+def compact_block(result: Any) -> Any:
+    if not isinstance(result, dict) or "address_summary" not in result:
+        return result
+    address_summary = result["address_summary"]
+    return {
+        **result,
+        "address_summary": {
+            "unique_senders_count": len(address_summary["unique_senders"]),
+            "unique_receivers_count": len(address_summary["unique_receivers"]),
+            "total_unique_addresses": address_summary["total_unique_addresses"],
+            "sample_senders": address_summary["unique_senders"][:constants.TOOL_OUTPUT_MAX_LIST_ITEMS],
+            "sample_receivers": address_summary["unique_receivers"][:constants.TOOL_OUTPUT_MAX_LIST_ITEMS]
+        }
+    }
+
+QUOTE_FIELDS = ("quoteId", "srcTokenAmount", "dstTokenAmount", "recommendedPreset", "prices")
+PRESET_FIELDS = ("auctionDuration", "auctionStartAmount", "auctionEndAmount", "costInDstToken", "allowPartialFills")
+
+@compactor(constants.FETCH_QUOTE)
+def compact_quote(result: Any) -> Any:
+    if not isinstance(result, dict) or "quoteId" not in result:
+        return result
+    compact = {field: result[field] for field in QUOTE_FIELDS if field in result}
+    compact["presets"] = {
+        name: {field: preset[field] for field in PRESET_FIELDS if field in preset}
+        for name, preset in (result.get("presets") or {}).items()
+        if isinstance(preset, dict)
+    }
+    return compact
+
+def compact_result(tool_name: str, result: Any, result_id: Optional[str] = None) -> str:
+    """
+    Return the compact encoding of a tool result that is sent to the model.
+
+    Args:
+        tool_name (str): Name of the tool that produced the result.
+        result (Any): The full tool result.
+        result_id (str, optional): Id of the full result in the result store.
+
+    Returns:
+        str: Minified JSON of the compacted result.
+    """
+    compact = limit_size(COMPACTORS.get(tool_name, lambda value: value)(result))
+    if result_id is not None and isinstance(compact, dict):
+        compact["result_id"] = result_id
+    return json.dumps(compact, separators=(",", ":"), default=str)
+
+def compact_tool(func: Callable) -> StructuredTool:
+    """
+    Turn a tool function into a tool whose message content is a compact encoding of its
+    result. The full result travels as the message artifact and is kept in the result
+    store under the `result_id` included in the compact content.
+    """
+    @functools.wraps(func)
+    def run(*args, **kwargs) -> Tuple[str, Any]:
+        result = func(*args, **kwargs)
+        result_id = tool_result_store.put(result, get_conversation_id()) if isinstance(result, dict) else None
+        return compact_result(func.__name__, result, result_id), result
+
+    return StructuredTool.from_function(func=run, response_format="content_and_artifact")
+
+def get_full_tool_result(result_id: str, path: Optional[str] = None) -> Any:
+    """
+    Look up the full, uncompacted result of an earlier tool call.
+
+    Tool results sent to you are compacted and carry a result_id; use this tool when you
+    need fields or list items that were left out. Full results are only kept for a
+    while: if the result has expired, call the original tool again.
+
+    Args:
+        result_id (str): The result_id included in the compacted tool result.
+        path (str, optional): Dot-separated path to return only part of the result, e.g. "address_summary.unique_senders".
+    """
+    result = tool_result_store.get(result_id, get_conversation_id())
+    if result is None:
+        # Also the answer for another conversation's id, so ids can't be probed
+        return {"error": "Result expired; call the original tool again for the full result"}
+    for key in path.split(".") if path else []:
+        if isinstance(result, dict) and key in result:
+            result = result[key]
+        elif isinstance(result, list) and key.isdigit() and int(key) < len(result):
+            result = result[int(key)]
+        else:
+            return {"error": f"Path not found: {path}"}
+    return result
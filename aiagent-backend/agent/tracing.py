@@ -0,0 +1,60 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from telemetry import get_conversation_id, record_span
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Record every LLM step and tool invocation of an agent run as a span.
+
+    Runs are matched by run_id, so one handler serves all concurrent conversations.
+    The conversation id comes from the run's thread_id, or the surrounding
+    conversation context.
+    """
+
+    # Call synchronously even under astream, so timings aren't skewed by executor hops
+    run_inline = True
+
+    def __init__(self):
+        # run_id -> (kind, name, start, conversation_id)
+        self._runs: Dict[UUID, Tuple[str, str, float, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, kind: str, name: str, metadata: Optional[Dict[str, Any]]) -> None:
+        thread_id = (metadata or {}).get("thread_id")
+        conversation_id = str(thread_id) if thread_id is not None else get_conversation_id()
+        with self._lock:
+            self._runs[run_id] = (kind, name, time.perf_counter(), conversation_id)
+
+    def _end(self, run_id: UUID, status: str) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is not None:
+            kind, name, start, conversation_id = run
+            record_span(kind, name, time.perf_counter() - start, status, conversation_id)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        serialized = serialized or {}
+        name = serialized.get("kwargs", {}).get("model_name") or (serialized.get("id") or ["llm"])[-1]
+        self._start(run_id, "llm", name, metadata)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, "ok")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, "error")
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self._start(run_id, "tool", (serialized or {}).get("name") or kwargs.get("name") or "tool", metadata)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, "ok")
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, "error")
+
+tracing_handler = TracingCallbackHandler()
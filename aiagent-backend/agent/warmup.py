@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def _initialize_agent() -> Any:
+    # Imported here so the LLM, LangGraph and CDP dependencies load on the warm-up
+    # thread rather than while the server is starting
+    from agent.initialize_agent import initialize_agent
+    return initialize_agent()
+
+class AgentWarmup:
+    """
+    Build the agent executor on a background thread, so the server accepts connections
+    and answers readiness probes while the agent is still being initialized.
+
+    Waiters are released as soon as the outcome is known, whether initialization
+    succeeded or failed.
+    """
+
+    def __init__(self, initializer: Callable[[], Any] = _initialize_agent):
+        self._initializer = initializer
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        # Set once the current attempt has finished, successfully or not
+        self._done = threading.Event()
+        self._listeners: List[Callable[[], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self.executor: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+
+    def start(self) -> None:
+        """
+        Start initializing the agent unless it is ready or already warming up. Calling
+        this again after a failure retries.
+        """
+        with self._lock:
+            if self._ready.is_set() or (self._thread and self._thread.is_alive()):
+                return
+            self.error = None
+            self._done.clear()
+            self.started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="agent-warmup", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            executor = self._initializer()
+        except Exception as e:
+            logger.exception("Agent initialization failed: %s", e)
+            self.error = str(e)
+            self._finish()
+            return
+        self.set_executor(executor)
+        logger.info("Agent ready in %.2fs", self.ready_at - self.started_at)
+
+    def set_executor(self, executor: Any) -> None:
+        """
+        Mark the agent as ready with the given executor, e.g. one built up front.
+        """
+        self.executor = executor
+        self.ready_at = time.monotonic()
+        if self.started_at is None:
+            self.started_at = self.ready_at
+        self._ready.set()
+        self._finish()
+
+    def _finish(self) -> None:
+        """Release every waiter of the current attempt."""
+        with self._lock:
+            self._done.set()
+            listeners, self._listeners = self._listeners, []
+        for listener in listeners:
+            listener()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for the agent initialization to finish.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Waits indefinitely by default.
+
+        Returns:
+            The agent executor, or None if initialization failed or did not finish within the timeout.
+        """
+        if not self._ready.is_set():
+            self._done.wait(timeout)
+        return self.executor
+
+    async def wait_async(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Like wait(), but awaited on the event loop instead of holding a thread.
+        """
+        if self._ready.is_set():
+            return self.executor
+
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+
+        def notify() -> None:
+            try:
+                loop.call_soon_threadsafe(done.set)
+            except RuntimeError:
+                # The loop has been closed; nobody is waiting any more
+                pass
+
+        with self._lock:
+            finished = self._done.is_set()
+            if not finished:
+                self._listeners.append(notify)
+        if not finished:
+            try:
+                await asyncio.wait_for(done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    if notify in self._listeners:
+                        self._listeners.remove(notify)
+        return self.executor
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Report the warm-up state: "idle", "warming", "ready" or "failed".
+        """
+        if self._ready.is_set():
+            state = "ready"
+        elif self.error is not None:
+            state = "failed"
+        elif self.started_at is not None:
+            state = "warming"
+        else:
+            state = "idle"
+        end = self.ready_at if self.ready_at is not None else time.monotonic()
+        return {
+            "state": state,
+            "error": self.error,
+            "seconds": round(end - self.started_at, 3) if self.started_at is not None else None
+        }
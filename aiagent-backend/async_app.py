@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import os
+from aiohttp import web
+from dotenv import load_dotenv
+
+import constants
+from agent.warmup import AgentWarmup
+from db.setup import setup
+from db.tokens import get_tokens_page
+from db.nfts import get_nfts_page
+from db.listing import get_listing
+from telemetry import configure_logging, registry
+
+logger = logging.getLogger(__name__)
+
+# No Connection header, as in the Flask app: it is hop-by-hop and left to the server
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'Content-Type': 'text/event-stream',
+    'X-Accel-Buffering': 'no'
+}
+
+@web.middleware
+async def cors_middleware(request: web.Request, handler):
+    """Allow cross origin requests from any origin, matching the Flask app"""
+    if request.method == 'OPTIONS':
+        response = web.Response()
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = request.headers.get('Access-Control-Request-Headers', '*')
+    else:
+        response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+def etag_matches(request: web.Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches an ETag"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix('W/').strip('"') for tag in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+async def chat(request: web.Request) -> web.StreamResponse:
+    try:
+        data = await request.json()
+        # Parse the user input from the request
+        input = data['input']
+        # Use the conversation_id passed in the request for conversation memory
+        config = {"configurable": {"thread_id": data['conversation_id']}}
+        stream_tokens = bool(data.get('stream_tokens', False))
+    except Exception as e:
+        logger.error(f"Unexpected error in chat endpoint: {str(e)}")
+        return web.json_response({'error': 'An unexpected error occurred'}, status=500)
+
+    warmup = request.app['agent_warmup']
+    warmup.start()
+    agent_executor = await warmup.wait_async(constants.AGENT_READY_TIMEOUT_SECONDS)
+    if agent_executor is None:
+        return web.json_response({'error': 'Agent is not ready'}, status=503, headers={'Retry-After': '5'})
+
+    from agent.run_agent import arun_agent
+    response = web.StreamResponse(headers=SSE_HEADERS)
+    await response.prepare(request)
+    async for message in arun_agent(input, agent_executor, config, stream_tokens):
+        await response.write(message.encode())
+    await response.write_eof()
+    return response
+
+def query_int(request: web.Request, name: str, default=None):
+    """Integer query parameter, or the default when missing or malformed, as Flask's args.get(type=int)"""
+    try:
+        return int(request.query[name])
+    except (KeyError, ValueError):
+        return default
+
+async def listing(request: web.Request, name: str, fetch_page) -> web.Response:
+    """Serve a cached keyset page (?after=<id>&limit=) of a listing, answering 304 when the ETag matches"""
+    try:
+        after = query_int(request, 'after', 0)
+        limit = query_int(request, 'limit')
+        limit = max(1, min(limit, constants.LISTING_MAX_LIMIT)) if limit is not None else None
+
+        payload, etag = await asyncio.to_thread(get_listing, name, fetch_page, after, limit)
+        headers = {'ETag': f'"{etag}"'}
+        if etag_matches(request, etag):
+            return web.Response(status=304, headers=headers)
+        return web.Response(text=json.dumps(payload), content_type='application/json', headers=headers)
+    except Exception as e:
+        logger.error(f"Unexpected error in {name} endpoint: {str(e)}")
+        return web.json_response({'error': 'An unexpected error occurred'}, status=500)
+
+async def tokens(request: web.Request) -> web.Response:
+    return await listing(request, 'tokens', get_tokens_page)
+
+async def nfts(request: web.Request) -> web.Response:
+    return await listing(request, 'nfts', get_nfts_page)
+
+async def ready(request: web.Request) -> web.Response:
+    """Readiness probe for load balancers: 200 once the agent can serve chats, 503 before"""
+    status = request.app['agent_warmup'].status()
+    return web.json_response(status, status=200 if status['state'] == 'ready' else 503)
+
+async def metrics(request: web.Request) -> web.Response:
+    """Prometheus metrics: span latency histograms, chat counters, cache and queue stats"""
+    return web.Response(body=registry.render().encode(), headers={'Content-Type': constants.METRICS_CONTENT_TYPE})
+
+async def index(request: web.Request) -> web.Response:
+    return web.Response(text="AI Agent Backend")
+
+def create_app(agent_executor=None) -> web.Application:
+    """
+    Create the async app serving /api/chat, /tokens and /nfts on one event loop.
+
+    Chat streams are driven with astream, so an open SSE connection holds no thread
+    while it waits on the model or RPCs. Without an agent_executor, the agent is
+    initialized in the background once the app starts, and /ready reports progress.
+    """
+    app = web.Application(middlewares=[cors_middleware])
+    app['agent_warmup'] = AgentWarmup()
+    if agent_executor is not None:
+        app['agent_warmup'].set_executor(agent_executor)
+    else:
+        async def start_warmup(app: web.Application) -> None:
+            app['agent_warmup'].start()
+        app.on_startup.append(start_warmup)
+    app.router.add_post('/api/chat', chat)
+    app.router.add_get('/tokens', tokens)
+    app.router.add_get('/nfts', nfts)
+    app.router.add_get('/ready', ready)
+    app.router.add_get('/metrics', metrics)
+    app.router.add_get('/', index)
+    return app
+
+if __name__ == "__main__":
+    load_dotenv()
+    # Route every module's logging through the queue-backed structured logger
+    configure_logging()
+    # Setup SQLite tables
+    setup()
+    web.run_app(create_app(), port=int(os.getenv("PORT", 5000)))
@@ -0,0 +1,209 @@
+"""
+Micro-benchmarks of the custom actions' hot paths, replayed from recorded HTTP exchanges
+so the numbers don't move with network conditions.
+
+    poetry run python -m benchmarks.actions --iterations 50 --latency 0.02
+
+Without a cassette (or with --record), exchanges are first recorded against the local
+stand-ins from benchmarks/stubs.py; --live records against the configured endpoints
+instead. Everything runs in a sandbox: a temporary database, a fixed throwaway wallet
+key, no background block follower, and no network access while replaying: a request
+missing from the cassette fails the run.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from benchmarks.metrics import environment, summarize, write_results
+from benchmarks.replay import Cassette, RecordReplayAdapter, app_sessions, install
+from benchmarks.stubs import JsonRpcStub, OneInchStub
+
+DEFAULT_CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "actions.json")
+
+# Throwaway key so quote requests, which carry the wallet address, replay exactly
+SANDBOX_PRIVATE_KEY = "0x" + "42" * 32
+
+ETH_USD_FEED_ID = "0xff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace"
+QUOTE_ARGS = {
+    "src_chain": 8453,
+    "dst_chain": 42161,
+    "from_token": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+    "to_token": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
+    "amount": 1000000
+}
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replayed micro-benchmarks of the custom actions")
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE, help="Recorded exchanges to replay")
+    parser.add_argument("--record", action="store_true", help="Re-record the cassette before replaying")
+    parser.add_argument("--live", action="store_true", help="Record against the configured endpoints instead of local stand-ins")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured iterations per case")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds injected into each replayed response")
+    parser.add_argument("--tx-per-block", type=int, default=1000, help="Transactions per block when recording from stand-ins")
+    parser.add_argument("--range-blocks", type=int, default=10, help="Blocks covered by the block range case")
+    parser.add_argument("--output", help="Results file; defaults to benchmarks/results/actions-<timestamp>.json")
+    return parser.parse_args()
+
+def enter_sandbox(work_dir: str) -> None:
+    """Isolate the run; must happen before the app modules are imported"""
+    os.environ["AGENT_DB_PATH"] = os.path.join(work_dir, "benchmark.db")
+    os.environ["WALLET_PRIVATE_KEY"] = SANDBOX_PRIVATE_KEY
+    os.environ.setdefault("ONEINCH_API_KEY", "benchmark")
+    os.environ["AGENT_WARMUP"] = "0"
+
+def build_cases(args: argparse.Namespace) -> Dict[str, Callable[[], Any]]:
+    """
+    Create the benchmark cases. Setup requests (the block and quote used by the
+    CPU-only cases) are made here, so recording and replaying issue the same requests.
+
+    The block head follower is kept off its polling thread, and the get_latest_block
+    case clears its buffer before each call, so every iteration fetches and summarizes
+    the head inline through the cassette rather than returning a buffered copy.
+    """
+    import constants
+    from agent.custom_actions import get_price
+    from agent.custom_actions.get_block_range_stats import get_block_range_stats
+    from agent.custom_actions.get_latest_block import block_follower, get_latest_block, iter_block_transactions, summarize_block
+    from agent.tool_output import compact_result
+    from chain.provider import get_web3
+    from oneinch.client import get_client
+
+    block_follower.stop()
+    block_follower.background = False
+
+    w3 = get_web3(constants.BASE_SEPOLIA_RPC_URL)
+    client = get_client()
+    block = w3.eth.get_block("latest", full_transactions=True)
+    client.quote_cache.clear()
+    quote = client.get_quote(**QUOTE_ARGS)
+
+    def uncached_price() -> Any:
+        get_price.clear_cache()
+        return get_price.get_price_from_pyth(ETH_USD_FEED_ID, 86400)
+
+    def uncached_latest_block() -> Any:
+        block_follower.clear()
+        return get_latest_block()
+
+    def uncached_quote() -> Any:
+        client.quote_cache.clear()
+        return client.get_quote(**QUOTE_ARGS)
+
+    return {
+        "fetch_large_block": lambda: w3.eth.get_block("latest", full_transactions=True),
+        "summarize_large_block": lambda: summarize_block(block),
+        "iter_block_transactions": lambda: list(iter_block_transactions(block)),
+        "get_latest_block": uncached_latest_block,
+        "get_block_range_stats": lambda: get_block_range_stats(last_n_blocks=args.range_blocks),
+        "get_price_from_pyth": uncached_price,
+        "fetch_quote": uncached_quote,
+        "compact_quote": lambda: compact_result(constants.FETCH_QUOTE, quote),
+        "fetch_active_orders": lambda: client.fetch_active_orders(),
+    }
+
+def measure(func: Callable[[], Any], iterations: int) -> Dict[str, Any]:
+    """
+    Measure one case: wall time per iteration, process CPU time per iteration, and the
+    allocations of one further traced iteration.
+
+    CPU time is process-wide, so any background threads are included; injected replay
+    latency is not, as it is spent sleeping.
+    """
+    func()
+
+    wall = []
+    cpu_start = time.process_time()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        wall.append(time.perf_counter() - start)
+    cpu = time.process_time() - cpu_start
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+
+    return {
+        "iterations": iterations,
+        "wall": summarize(wall),
+        "cpu_ms_per_iteration": round(cpu / iterations * 1000, 3) if iterations else None,
+        "peak_allocated_bytes": peak,
+        "retained_bytes": sum(stat.size_diff for stat in diff),
+        "retained_blocks": sum(stat.count_diff for stat in diff),
+    }
+
+def rpc_urls():
+    import constants
+    return [constants.BASE_SEPOLIA_RPC_URL, constants.BASE_MAINNET_RPC_URL]
+
+def check_misses(adapter: RecordReplayAdapter, stage: str) -> None:
+    """Fail the run if any request missed the cassette, even if the app swallowed the error"""
+    if adapter.misses:
+        raise SystemExit(
+            f"{len(adapter.misses)} request(s) in {stage} are not in the cassette; re-record with --record: "
+            + ", ".join(sorted(set(adapter.misses)))
+        )
+
+def record(args: argparse.Namespace) -> None:
+    """Record every case once into the cassette"""
+    stubs = []
+    if not args.live:
+        # A fixed head keeps "latest" on one block for the whole recording
+        stubs = [JsonRpcStub(tx_per_block=args.tx_per_block, block_time=3600).start(), OneInchStub().start()]
+        os.environ["BASE_SEPOLIA_RPC_URL"] = stubs[0].url
+        os.environ["BASE_MAINNET_RPC_URL"] = stubs[0].url
+        os.environ["WEB3_PROVIDER_URL"] = stubs[0].url
+        os.environ["ONEINCH_API_URL"] = stubs[1].url
+
+    cassette = Cassette()
+    install(RecordReplayAdapter(cassette, mode="record"), app_sessions(rpc_urls()))
+    try:
+        for case in build_cases(args).values():
+            case()
+    finally:
+        for stub in stubs:
+            stub.stop()
+    cassette.save(args.cassette)
+    print(f"Recorded {len(cassette.exchanges)} exchanges to {args.cassette}")
+
+def main() -> None:
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        enter_sandbox(work_dir)
+        if args.record or not os.path.exists(args.cassette):
+            record(args)
+
+        adapter = RecordReplayAdapter(Cassette.load(args.cassette), mode="replay", latency=args.latency)
+        install(adapter, app_sessions(rpc_urls()))
+        cases = build_cases(args)
+        check_misses(adapter, "setup")
+
+        measured = {}
+        for name, case in cases.items():
+            measured[name] = measure(case, args.iterations)
+            check_misses(adapter, name)
+
+        results = {
+            "benchmark": "actions",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "config": vars(args),
+            "environment": environment(),
+            "cases": measured,
+        }
+
+    path = write_results("actions", results, args.output)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
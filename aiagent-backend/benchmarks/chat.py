@@ -0,0 +1,199 @@
+"""
+End-to-end chat benchmark: drives /api/chat with a scripted chat model against local
+stand-ins for the Base JSON-RPC endpoints and the 1inch API, so runs cost nothing and
+don't depend on public services.
+
+    poetry run python -m benchmarks.chat --server flask --turns 20 --concurrency 8 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.metrics import environment, summarize, write_results
+from benchmarks.stubs import JsonRpcStub, OneInchStub
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark of the chat endpoint")
+    parser.add_argument("--server", choices=["flask", "async"], default="flask", help="Which app serves /api/chat")
+    parser.add_argument("--turns", type=int, default=20, help="Sequential turns in one conversation")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent streams in the throughput phase")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to sustain concurrent streams")
+    parser.add_argument("--stream-tokens", action="store_true", help="Request token-level streaming")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per model call")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per streamed answer chunk")
+    parser.add_argument("--rpc-latency", type=float, default=0.02, help="Seconds per JSON-RPC request")
+    parser.add_argument("--oneinch-latency", type=float, default=0.05, help="Seconds per 1inch API request")
+    parser.add_argument("--tx-per-block", type=int, default=150, help="Transactions in each synthetic block")
+    parser.add_argument("--output", help="Results file; defaults to benchmarks/results/chat-<timestamp>.json")
+    return parser.parse_args()
+
+def point_at_stubs(rpc: JsonRpcStub, oneinch: OneInchStub, db_dir: str) -> None:
+    """Route every outbound call to the stand-ins; must run before the app modules are imported"""
+    os.environ["BASE_SEPOLIA_RPC_URL"] = rpc.url
+    os.environ["BASE_MAINNET_RPC_URL"] = rpc.url
+    os.environ["WEB3_PROVIDER_URL"] = rpc.url
+    os.environ["ONEINCH_API_URL"] = oneinch.url
+    os.environ.setdefault("ONEINCH_API_KEY", "benchmark")
+    os.environ["AGENT_DB_PATH"] = os.path.join(db_dir, "benchmark.db")
+    os.environ["AGENT_WARMUP"] = "0"
+
+def build_executor(args: argparse.Namespace):
+    from agent.initialize_agent import build_agent
+    from benchmarks.fake_llm import ScriptedChatModel
+    from db.setup import setup
+
+    setup()
+    llm = ScriptedChatModel(latency=args.llm_latency, token_latency=args.token_latency)
+    return build_agent(llm, [])
+
+def serve_flask(agent_executor) -> Tuple[str, Callable[[], None]]:
+    from werkzeug.serving import make_server
+    import index
+
+    index.app.agent_executor = agent_executor
+    server = make_server("127.0.0.1", 0, index.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="flask-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+def serve_async(agent_executor) -> Tuple[str, Callable[[], None]]:
+    from aiohttp import web
+    from async_app import create_app
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(create_app(agent_executor))
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = runner.addresses[0][1]
+    threading.Thread(target=loop.run_forever, name="async-server", daemon=True).start()
+
+    def stop() -> None:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+    return f"http://127.0.0.1:{port}", stop
+
+def connection_headers(args: argparse.Namespace) -> Dict[str, str]:
+    """
+    Per-turn request headers. The werkzeug server closes every connection after a
+    response, so Flask turns ask for that up front and each opens a fresh connection
+    rather than trying to reuse the closed one.
+    """
+    return {"Connection": "close"} if args.server == "flask" else {}
+
+def run_turn(session, base_url: str, conversation_id: str, stream_tokens: bool, headers: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Send one chat turn and time its SSE events.
+
+    Returns:
+        Dict[str, Any]: Time to first event, the gaps between complete (non-partial)
+        events, the whole turn's latency, and the number of error events.
+    """
+    start = time.perf_counter()
+    first_event = None
+    last_step = start
+    steps: List[float] = []
+    errors = 0
+
+    payload = {"input": "What's new on Base, and what would 1 USDC get me on Arbitrum?", "conversation_id": conversation_id, "stream_tokens": stream_tokens}
+    with session.post(f"{base_url}/api/chat", json=payload, headers=headers, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            now = time.perf_counter()
+            if first_event is None:
+                first_event = now - start
+            event = json.loads(line)
+            if event.get("event") == "error":
+                errors += 1
+            if not event.get("partial"):
+                steps.append(now - last_step)
+                last_step = now
+
+    return {
+        "first_event": first_event,
+        "steps": steps,
+        "turn": time.perf_counter() - start,
+        "errors": errors,
+    }
+
+def summarize_turns(turns: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "turns": len(turns),
+        "errors": sum(turn["errors"] for turn in turns),
+        "time_to_first_event": summarize([turn["first_event"] for turn in turns if turn["first_event"] is not None]),
+        "step_latency": summarize([step for turn in turns for step in turn["steps"]]),
+        "turn_latency": summarize([turn["turn"] for turn in turns]),
+    }
+
+def sequential_phase(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Turns one after another in a single conversation, so history grows as in real use"""
+    import requests
+
+    with requests.Session() as session:
+        turns = [
+            run_turn(session, base_url, "bench-sequential", args.stream_tokens, connection_headers(args))
+            for _ in range(args.turns)
+        ]
+    return summarize_turns(turns)
+
+def concurrent_phase(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Concurrent streams, one conversation each, for a fixed duration"""
+    import requests
+
+    deadline = time.perf_counter() + args.duration
+
+    def worker(index: int) -> List[Dict[str, Any]]:
+        turns = []
+        with requests.Session() as session:
+            while time.perf_counter() < deadline:
+                turns.append(run_turn(session, base_url, f"bench-concurrent-{index}", args.stream_tokens, connection_headers(args)))
+        return turns
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        turns = [turn for worker_turns in pool.map(worker, range(args.concurrency)) for turn in worker_turns]
+    elapsed = time.perf_counter() - start
+
+    results = summarize_turns(turns)
+    results["concurrency"] = args.concurrency
+    results["elapsed_seconds"] = round(elapsed, 3)
+    results["throughput_turns_per_second"] = round(len(turns) / elapsed, 3) if elapsed else None
+    return results
+
+def main() -> None:
+    args = parse_args()
+    rpc = JsonRpcStub(latency=args.rpc_latency, tx_per_block=args.tx_per_block).start()
+    oneinch = OneInchStub(latency=args.oneinch_latency).start()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        point_at_stubs(rpc, oneinch, db_dir)
+        agent_executor = build_executor(args)
+        base_url, stop = (serve_flask if args.server == "flask" else serve_async)(agent_executor)
+        try:
+            results = {
+                "benchmark": "chat",
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "config": vars(args),
+                "environment": environment(),
+                "sequential": sequential_phase(base_url, args),
+                "concurrent": concurrent_phase(base_url, args),
+            }
+        finally:
+            stop()
+            rpc.stop()
+            oneinch.stop()
+
+    results["stub_requests"] = {"rpc": rpc.requests, "oneinch": oneinch.requests}
+    path = write_results("chat", results, args.output)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
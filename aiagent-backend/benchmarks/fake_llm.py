@@ -0,0 +1,91 @@
+import json
+import math
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Tool calls made on each step of a turn before the final answer
+DEFAULT_SCRIPT: List[List[Dict[str, Any]]] = [
+    [
+        {"name": "get_latest_block", "args": {}},
+        {"name": "fetch_quote", "args": {
+            "src_chain": 8453,
+            "dst_chain": 42161,
+            "from_token": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+            "to_token": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
+            "amount": 1000000
+        }},
+    ],
+    [
+        {"name": "get_price_from_pyth", "args": {
+            "price_feed_id": "0xff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace",
+            "max_age_seconds": 60
+        }},
+    ],
+]
+
+DEFAULT_ANSWER = (
+    "The latest Base Sepolia block is summarized above, the quote for 1 USDC from Base to "
+    "Arbitrum is ready, and ETH is trading close to its recent price."
+)
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that plays back a fixed script of tool calls, then answers with canned text.
+
+    The step within a turn is the number of AI messages since the last human message,
+    so the script restarts on every turn. Latencies stand in for model response times.
+    """
+
+    script: List[List[Dict[str, Any]]] = DEFAULT_SCRIPT
+    answer: str = DEFAULT_ANSWER
+    latency: float = 0.0
+    token_latency: float = 0.0
+    chunk_chars: int = 4
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        step = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, AIMessage):
+                step += 1
+
+        if step < len(self.script):
+            return AIMessage(content="", tool_calls=[
+                {"name": call["name"], "args": call.get("args", {}), "id": f"call_{uuid.uuid4().hex[:12]}"}
+                for call in self.script[step]
+            ])
+        return AIMessage(content=self.answer)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        message = self._next_message(messages)
+        if not message.tool_calls:
+            time.sleep(self.token_latency * math.ceil(len(message.content) / self.chunk_chars))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        message = self._next_message(messages)
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ]))
+            return
+        for start in range(0, len(message.content), self.chunk_chars):
+            time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=message.content[start:start + self.chunk_chars]))
@@ -0,0 +1,61 @@
+import json
+import math
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    rank = math.ceil(p / 100 * len(sorted_samples))
+    return sorted_samples[max(0, min(len(sorted_samples), rank) - 1)]
+
+def summarize(samples: List[float]) -> Dict[str, Optional[float]]:
+    """
+    Summarize latency samples given in seconds.
+
+    Returns:
+        Dict[str, Optional[float]]: Sample count, and mean, p50, p90, p99 and max in milliseconds.
+    """
+    if not samples:
+        return {"count": 0, "mean_ms": None, "p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p90_ms": round(percentile(ordered, 90) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine a benchmark ran on, so runs can be compared fairly"""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def write_results(name: str, results: Dict[str, Any], path: Optional[str] = None) -> str:
+    """
+    Write benchmark results as JSON.
+
+    Args:
+        name (str): Benchmark name, used in the default file name.
+        results (Dict[str, Any]): Results to write.
+        path (str, optional): Output file. Defaults to benchmarks/results/<name>-<timestamp>.json.
+
+    Returns:
+        str: The path written.
+    """
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+    return path
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+class ReplayMissError(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request that is not in the cassette"""
+
+def _canonical_body(body: Optional[bytes]) -> Any:
+    """JSON bodies without JSON-RPC ids, which differ between runs; raw text otherwise"""
+    if not body:
+        return None
+    text = body.decode() if isinstance(body, bytes) else body
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return text
+    if isinstance(payload, dict) and "jsonrpc" in payload:
+        return {key: value for key, value in payload.items() if key != "id"}
+    if isinstance(payload, list):
+        return [
+            {key: value for key, value in item.items() if key != "id"} if isinstance(item, dict) else item
+            for item in payload
+        ]
+    return payload
+
+def _request_ids(body: Optional[bytes]) -> List[Any]:
+    """JSON-RPC ids of a single or batched request, in order"""
+    if not body:
+        return []
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return []
+    items = payload if isinstance(payload, list) else [payload]
+    return [item.get("id") for item in items if isinstance(item, dict)]
+
+def exchange_key(method: str, url: str, body: Optional[bytes]) -> str:
+    """
+    Key a request by method, path, sorted query and canonical body.
+
+    The host is left out so exchanges recorded against one endpoint (e.g. a local
+    stand-in) replay under another.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return json.dumps([method.upper(), parts.path or "/", query, _canonical_body(body)], sort_keys=True)
+
+class Cassette:
+    """
+    Recorded HTTP exchanges, stored as JSON. Requests with the same key replay their
+    recorded responses in order, cycling once they run out.
+    """
+
+    def __init__(self, exchanges: Optional[List[Dict[str, Any]]] = None):
+        self.exchanges: List[Dict[str, Any]] = exchanges or []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for exchange in self.exchanges:
+            self._by_key.setdefault(exchange["key"], []).append(exchange)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path) as file:
+            return cls(json.load(file)["exchanges"])
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"exchanges": self.exchanges}, file)
+
+    def record(self, exchange: Dict[str, Any]) -> None:
+        with self._lock:
+            self.exchanges.append(exchange)
+            self._by_key.setdefault(exchange["key"], []).append(exchange)
+
+    def next(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            recorded = self._by_key.get(key)
+            if not recorded:
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            return recorded[index % len(recorded)]
+
+class RecordReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter that records real HTTP exchanges into a cassette, or replays them
+    without touching the network.
+
+    In replay mode every response is delayed by `latency` seconds to stand in for the
+    network, JSON-RPC ids are rewritten to match the live request, and a request
+    missing from the cassette raises ReplayMissError rather than going out. Misses are
+    also kept in `misses`, since the app code often catches the error and carries on.
+
+    Args:
+        cassette (Cassette): Where exchanges are recorded to or replayed from.
+        mode (str): "record" or "replay".
+        latency (float): Seconds added to each replayed response.
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = "replay", latency: float = 0.0, **kwargs: Any):
+        super().__init__(**kwargs)
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self.misses: List[str] = []
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        key = exchange_key(request.method, request.url, request.body)
+        if self.mode == "record":
+            response = super().send(request, **kwargs)
+            self.cassette.record({
+                "key": key,
+                "request": {
+                    "method": request.method,
+                    "url": request.url,
+                    "body": request.body.decode() if isinstance(request.body, bytes) else request.body
+                },
+                "response": {
+                    "status": response.status_code,
+                    "headers": {"Content-Type": response.headers.get("Content-Type", "application/json")},
+                    "body": response.content.decode()
+                }
+            })
+            return response
+
+        exchange = self.cassette.next(key)
+        if exchange is None:
+            self.misses.append(f"{request.method} {request.url}")
+            raise ReplayMissError(f"No recorded exchange for {request.method} {request.url}", request=request)
+        if self.latency:
+            time.sleep(self.latency)
+        return self._build_replayed(request, exchange)
+
+    def _build_replayed(self, request: requests.PreparedRequest, exchange: Dict[str, Any]) -> requests.Response:
+        body = exchange["response"]["body"]
+
+        # Map recorded JSON-RPC ids onto the ids of the live request, by position
+        live_ids = _request_ids(request.body)
+        if live_ids:
+            recorded_ids = _request_ids(exchange["request"]["body"])
+            id_map = {json.dumps(old): new for old, new in zip(recorded_ids, live_ids)}
+            payload = json.loads(body)
+            for item in payload if isinstance(payload, list) else [payload]:
+                if isinstance(item, dict) and "id" in item:
+                    item["id"] = id_map.get(json.dumps(item["id"]), item["id"])
+            body = json.dumps(payload)
+
+        response = requests.Response()
+        response.status_code = exchange["response"]["status"]
+        response.headers = CaseInsensitiveDict(exchange["response"]["headers"])
+        response._content = body.encode()
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if response.status_code < 400 else "Error"
+        response.connection = self
+        return response
+
+def install(adapter: RecordReplayAdapter, sessions: Iterable[requests.Session]) -> None:
+    """Mount an adapter for both schemes on each session"""
+    for session in sessions:
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+def app_sessions(rpc_urls: Iterable[str]) -> List[requests.Session]:
+    """
+    The pooled sessions behind the on-chain custom actions and OneInchClient: one per
+    RPC URL (chain.provider), which every thread posts through, plus the 1inch
+    transport's session.
+    """
+    from chain.provider import get_session
+    from oneinch.client import get_client
+
+    return [get_session(url) for url in rpc_urls] + [get_client().transport.session]
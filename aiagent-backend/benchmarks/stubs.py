@@ -0,0 +1,256 @@
+import json
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real endpoints, so client connection pools are exercised
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = urlparse(self.path)
+        stub: StubServer = self.server.stub
+
+        stub.count_request()
+        if stub.latency:
+            time.sleep(stub.latency)
+        status, payload = stub.handle(self.command, url.path, parse_qs(url.query), body)
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+class StubServer:
+    """
+    Local HTTP stand-in for a remote API, served on an ephemeral port from a background thread.
+
+    Args:
+        latency (float): Seconds to wait before answering each request.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, Any]:
+        raise NotImplementedError
+
+def _word(value: int) -> str:
+    """ABI-encode an integer as one 32-byte two's complement word"""
+    return f"{value % (1 << 256):064x}"
+
+def _address(index: int) -> str:
+    return f"0x{index + 1:040x}"
+
+class JsonRpcStub(StubServer):
+    """
+    Stand-in for the Base JSON-RPC endpoints, answering single and batched requests.
+
+    The head advances every `block_time` seconds and every block carries
+    `tx_per_block` synthetic transactions drawn from a pool of `address_pool`
+    addresses. Any eth_call answers with a Pyth price struct.
+    """
+
+    def __init__(self, latency: float = 0.0, tx_per_block: int = 150, block_time: float = 2.0, address_pool: int = 500, chain_id: int = 84532, start_block: int = 18_000_000):
+        super().__init__(latency)
+        self.tx_per_block = tx_per_block
+        self.block_time = block_time
+        self.address_pool = address_pool
+        self.chain_id = chain_id
+        self.start_block = start_block
+        self.started_at = time.time()
+        self._block = lru_cache(maxsize=256)(self._build_block)
+
+    def head(self) -> int:
+        return self.start_block + int((time.time() - self.started_at) / self.block_time)
+
+    def _build_block(self, number: int, full: bool) -> Dict[str, Any]:
+        block_hash = f"0x{number:064x}"
+        transactions = []
+        for index in range(self.tx_per_block):
+            seed = number * self.tx_per_block + index
+            tx = {
+                "hash": f"0x{seed:064x}",
+                "blockHash": block_hash,
+                "blockNumber": hex(number),
+                "transactionIndex": hex(index),
+                "from": _address(seed % self.address_pool),
+                # Every tenth transaction is a contract creation
+                "to": _address((seed * 7 + 3) % self.address_pool) if index % 10 else None,
+                "value": hex((seed % 1000) * 10 ** 14),
+                "gas": hex(21000),
+                "gasPrice": hex(1_000_000_000 + (seed % 500) * 1_000_000),
+                "nonce": hex(seed % 1000),
+                "input": "0x",
+                "type": "0x0",
+                "chainId": hex(self.chain_id),
+                "v": "0x1",
+                "r": f"0x{seed + 1:064x}",
+                "s": f"0x{seed + 2:064x}",
+            }
+            transactions.append(tx if full else tx["hash"])
+        return {
+            "number": hex(number),
+            "hash": block_hash,
+            "parentHash": f"0x{number - 1:064x}",
+            "timestamp": hex(int(self.started_at + (number - self.start_block) * self.block_time)),
+            "miner": _address(0),
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(21000 * self.tx_per_block),
+            "baseFeePerGas": hex(1_000_000),
+            "transactions": transactions,
+        }
+
+    def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method, params = request.get("method"), request.get("params") or []
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+
+        if method == "eth_chainId":
+            response["result"] = hex(self.chain_id)
+        elif method == "net_version":
+            response["result"] = str(self.chain_id)
+        elif method == "eth_blockNumber":
+            response["result"] = hex(self.head())
+        elif method == "eth_getBlockByNumber":
+            tag, full = params[0], bool(params[1]) if len(params) > 1 else False
+            head = self.head()
+            number = head if tag in ("latest", "pending", "safe", "finalized") else int(tag, 16)
+            response["result"] = self._block(number, full) if 0 <= number <= head else None
+        elif method == "eth_call":
+            # Price, confidence, exponent and publish time of a Pyth price feed
+            price = (250_000_000_000, 150_000_000, -8, int(time.time()))
+            response["result"] = "0x" + "".join(_word(value) for value in price)
+        else:
+            response["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+        return response
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, Any]:
+        payload = json.loads(body or b"null")
+        if isinstance(payload, list):
+            return 200, [self.call(request) for request in payload]
+        if isinstance(payload, dict):
+            return 200, self.call(payload)
+        return 400, {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid request"}}
+
+QUOTE_PRESET = {
+    "auctionDuration": 180,
+    "startAuctionIn": 24,
+    "initialRateBump": 84909,
+    "auctionStartAmount": "1005438",
+    "startAmount": "997398",
+    "auctionEndAmount": "991443",
+    "exclusiveResolver": None,
+    "costInDstToken": "8040",
+    "points": [{"delay": 12 * step, "coefficient": 84909 - 4000 * step} for step in range(12)],
+    "allowPartialFills": False,
+    "allowMultipleFills": False,
+    "gasCost": {"gasBumpEstimate": 80, "gasPriceEstimate": "1200"},
+    "secretsCount": 1,
+}
+
+class OneInchStub(StubServer):
+    """
+    Stand-in for the 1inch Fusion+ API: quotes, active orders (`active_orders` of them,
+    paginated), order status, order creation and secret submission.
+    """
+
+    def __init__(self, latency: float = 0.0, active_orders: int = 250):
+        super().__init__(latency)
+        self.orders = [self._order(index) for index in range(active_orders)]
+
+    @staticmethod
+    def _order(index: int) -> Dict[str, Any]:
+        return {
+            "orderHash": f"0x{index + 1:064x}",
+            "quoteId": f"quote-{index}",
+            "srcChainId": 8453,
+            "dstChainId": 42161,
+            "remainingMakerAmount": str(1_000_000 * (index + 1)),
+            "auctionStartDate": 1_700_000_000 + index,
+            "auctionEndDate": 1_700_000_180 + index,
+            "deadline": 1_700_003_600 + index,
+            "order": {
+                "salt": str(index),
+                "maker": _address(index),
+                "receiver": _address(0),
+                "makerAsset": "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913",
+                "takerAsset": "0xaf88d065e77c8cc2239327c5edb3a432268e5831",
+                "makingAmount": str(1_000_000 * (index + 1)),
+                "takingAmount": str(990_000 * (index + 1)),
+            },
+        }
+
+    def quote(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        amount = query.get("amount", ["1000000"])[0]
+        return {
+            "quoteId": f"quote-{amount}",
+            "srcTokenAmount": amount,
+            "dstTokenAmount": str(int(amount) * 99 // 100),
+            "presets": {name: dict(QUOTE_PRESET) for name in ("fast", "medium", "slow")},
+            "srcEscrowFactory": _address(900),
+            "dstEscrowFactory": _address(901),
+            "whitelist": [_address(1000 + index) for index in range(40)],
+            "timeLocks": {"srcWithdrawal": 36, "srcPublicWithdrawal": 372, "srcCancellation": 528, "dstWithdrawal": 60, "dstCancellation": 504},
+            "srcSafetyDeposit": "60000000000000",
+            "dstSafetyDeposit": "4000000000000",
+            "recommendedPreset": "fast",
+            "prices": {"usd": {"srcToken": "1.0001", "dstToken": "0.9998"}},
+            "volume": {"usd": {"srcToken": "1.00", "dstToken": "0.99"}},
+        }
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, Any]:
+        if path.endswith("/quote/receive"):
+            return 200, self.quote(query)
+        if path.endswith("/order/active"):
+            page = int(query.get("page", ["1"])[0])
+            limit = int(query.get("limit", ["100"])[0])
+            items = self.orders[(page - 1) * limit:page * limit]
+            total_pages = max(1, -(-len(self.orders) // limit))
+            return 200, {"items": items, "meta": {"totalItems": len(self.orders), "currentPage": page, "itemsPerPage": limit, "totalPages": total_pages}}
+        if path.endswith("/status"):
+            if method == "POST":
+                hashes = json.loads(body or b"{}").get("orderHashes", [])
+                return 200, [{"orderHash": order_hash, "status": "pending"} for order_hash in hashes]
+            return 200, {"orderHash": query.get("orderHash", [""])[0], "status": "pending"}
+        if path.endswith("/create"):
+            return 200, {"orderHash": f"0x{len(body):064x}"}
+        if path.endswith("/submit-secret") or "/swap/" in path:
+            return 200, {"success": True}
+        return 404, {"error": f"Not found: {path}"}
@@ -0,0 +1,12 @@
+from .provider import get_web3, get_chain_id, get_session
+from .batch import batch_request, BatchRequestError
+from .head_follower import BlockHeadFollower
+
+__all__ = [
+    'get_web3',
+    'get_chain_id',
+    'get_session',
+    'batch_request',
+    'BatchRequestError',
+    'BlockHeadFollower'
+]
@@ -0,0 +1,68 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+import constants
+from chain.provider import get_session
+from telemetry import span
+
+logger = logging.getLogger(__name__)
+
+class BatchRequestError(Exception):
+    """Raised when a node rejects a JSON-RPC batch as a whole"""
+
+def _post_batch(rpc_url: str, calls: List[Tuple[str, list]]) -> List[Optional[Any]]:
+    """Send one JSON-RPC batch and return results in call order, None for failed calls."""
+    payload = [
+        {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+        for index, (method, params) in enumerate(calls)
+    ]
+    with span("rpc", "batch"):
+        response = get_session(rpc_url).post(rpc_url, json=payload, timeout=constants.RPC_TIMEOUT_SECONDS)
+        response.raise_for_status()
+
+    data = response.json()
+    if not isinstance(data, list):
+        # Nodes answer a rejected batch (too large, batching disabled) with one error object
+        error = data.get("error") if isinstance(data, dict) else data
+        raise BatchRequestError(f"JSON-RPC batch of {len(calls)} calls rejected: {error}")
+
+    results: List[Optional[Any]] = [None] * len(calls)
+    for item in data:
+        index = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(index, int) or not 0 <= index < len(calls):
+            logger.warning("Unexpected item in JSON-RPC batch response: %s", item)
+        elif "error" in item:
+            logger.warning("JSON-RPC call %s failed in batch: %s", calls[index][0], item["error"])
+        else:
+            results[index] = item.get("result")
+    return results
+
+def batch_request(
+    rpc_url: str,
+    calls: List[Tuple[str, list]],
+    batch_size: int = constants.RPC_BATCH_SIZE,
+    max_workers: int = constants.RPC_BATCH_CONCURRENCY
+) -> List[Optional[Any]]:
+    """
+    Run JSON-RPC calls as batched requests with bounded concurrency.
+
+    Args:
+        rpc_url (str): The JSON-RPC endpoint to call.
+        calls (List[Tuple[str, list]]): (method, params) pairs.
+        batch_size (int): Maximum number of calls per HTTP request.
+        max_workers (int): Maximum number of batches in flight at once.
+
+    Returns:
+        List[Optional[Any]]: Raw results in call order; None where a call returned an error.
+
+    Raises:
+        BatchRequestError: If the node rejects a batch as a whole.
+    """
+    chunks = [calls[i:i + batch_size] for i in range(0, len(calls), batch_size)]
+    if len(chunks) <= 1:
+        return _post_batch(rpc_url, calls) if calls else []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        chunk_results = executor.map(lambda chunk: _post_batch(rpc_url, chunk), chunks)
+        return [result for chunk in chunk_results for result in chunk]
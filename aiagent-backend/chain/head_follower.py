@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import constants
+from chain.provider import get_web3
+
+logger = logging.getLogger(__name__)
+
+class BlockHeadFollower:
+    """
+    Follow the chain head in the background and keep summaries of recent blocks.
+
+    Every new block is fetched once and summarized by the `summarize` callback; the
+    last `history_size` summaries are kept in a ring buffer, so readers never wait on
+    the network while the follower is healthy. Only the head block and the last
+    block paged are kept raw, for paging their transaction detail.
+
+    With `idle_timeout` set, the polling thread exits once start() has not been
+    called for that many seconds; the next start() brings it back.
+
+    With `background` off, start() does nothing and readers refresh inline whenever
+    the buffer is stale, so every fetch happens on the caller's thread.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        summarize: Callable[[Any], Dict[str, Any]],
+        history_size: int = 32,
+        poll_interval: float = 1.0,
+        stale_after: float = 10.0,
+        background: bool = True,
+        idle_timeout: Optional[float] = None
+    ):
+        self.rpc_url = rpc_url
+        self.summarize = summarize
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.background = background
+        self.idle_timeout = idle_timeout
+
+        self._blocks: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._head_block: Optional[Any] = None
+        self._paged_block: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_poll = 0.0
+        self._last_used = time.monotonic()
+
+    def start(self) -> None:
+        """
+        Start the polling thread if background polling is on and it is not already
+        running. Every call counts as use for the idle timeout.
+        """
+        self._last_used = time.monotonic()
+        if not self.background or (self._thread and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="block-head-follower", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread."""
+        self._stop.set()
+
+    def _idle(self) -> bool:
+        return self.idle_timeout is not None and time.monotonic() - self._last_used > self.idle_timeout
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._idle():
+                with self._lock:
+                    # Recheck under the lock start() takes, so a caller either sees this thread gone or keeps it
+                    if self._idle():
+                        self._thread = None
+                        return
+            try:
+                self.refresh()
+            except Exception as e:
+                # Sampled, as a failing endpoint would otherwise log every poll
+                logger.error("Block follower error: %s", e, extra={"sample_rate": constants.LOG_ERROR_SAMPLE_RATE})
+            self._stop.wait(self.poll_interval)
+
+    def refresh(self, backfill: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and summarize blocks missing from the buffer up to the chain head.
+
+        Concurrent callers share one fetch: whoever holds the fetch lock does the
+        work and the others find the buffer already up to date.
+
+        Args:
+            backfill (bool): Also fill gaps left behind the head, up to the buffer size.
+                The request path passes False and fetches only the head block, leaving
+                the gaps to the polling thread.
+
+        Returns:
+            Optional[Dict[str, Any]]: The summary of the newest block.
+        """
+        with self._fetch_lock:
+            w3 = get_web3(self.rpc_url)
+            head = w3.eth.block_number
+            with self._lock:
+                buffered = {summary["block_number"] for summary in self._blocks}
+                oldest = self._blocks[0]["block_number"] if self._blocks else head
+
+            # Start from the head on a cold buffer, otherwise fill any gap within the window
+            first = max(head - self._blocks.maxlen + 1, oldest) if backfill else head
+            for number in range(first, head + 1):
+                if number in buffered:
+                    continue
+                block = w3.eth.get_block(number, full_transactions=True)
+                self._store(self.summarize(block), block)
+
+            self._last_poll = time.monotonic()
+            return self.latest(allow_stale=True)
+
+    def _store(self, summary: Dict[str, Any], block: Any) -> None:
+        with self._lock:
+            in_order = not self._blocks or summary["block_number"] > self._blocks[-1]["block_number"]
+            self._blocks.append(summary)
+            if not in_order:
+                self._blocks = deque(sorted(self._blocks, key=lambda item: item["block_number"]), maxlen=self._blocks.maxlen)
+            if self._head_block is None or block.number > self._head_block.number:
+                self._head_block = block
+
+    def clear(self) -> None:
+        """Forget every buffered block, so the next read fetches the head again."""
+        with self._lock:
+            self._blocks.clear()
+            self._head_block = None
+            self._paged_block = None
+            self._last_poll = 0.0
+
+    def is_stale(self) -> bool:
+        """Whether the buffer has not been refreshed within `stale_after` seconds."""
+        return time.monotonic() - self._last_poll > self.stale_after
+
+    def latest(self, allow_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """Return the newest buffered summary, or None if the buffer is empty or stale."""
+        if not allow_stale and self.is_stale():
+            return None
+        with self._lock:
+            return self._blocks[-1] if self._blocks else None
+
+    def summary(self, number: int) -> Optional[Dict[str, Any]]:
+        """Return the buffered summary of the block with the given number, if still in the buffer."""
+        with self._lock:
+            for summary in reversed(self._blocks):
+                if summary["block_number"] == number:
+                    return summary
+        return None
+
+    def raw_block(self, number: int) -> Optional[Any]:
+        """Return the raw block with the given number, if it is still the head block."""
+        with self._lock:
+            block = self._head_block
+        return block if block is not None and block.number == number else None
+
+    def page_block(self, number: int) -> Any:
+        """
+        Return the raw block with the given number for paging its transactions: the head
+        block or the last block paged, fetching and keeping it if it is neither.
+        """
+        block = self.raw_block(number)
+        if block is not None:
+            return block
+        with self._lock:
+            block = self._paged_block
+        if block is not None and block.number == number:
+            return block
+        block = get_web3(self.rpc_url).eth.get_block(number, full_transactions=True)
+        with self._lock:
+            self._paged_block = block
+        return block
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        """Return up to `count` buffered summaries, newest first."""
+        with self._lock:
+            return list(self._blocks)[::-1][:count]
@@ -0,0 +1,86 @@
+import threading
+from typing import Dict, Optional
+import requests
+from web3 import Web3
+
+import constants
+from telemetry import span
+from utils import build_http_session
+
+# Process-wide registry of Web3 instances keyed by RPC URL. Each entry owns a
+# keep-alive session so repeated tool calls reuse the same TCP/TLS connection.
+_lock = threading.Lock()
+_providers: Dict[str, Web3] = {}
+_sessions: Dict[str, requests.Session] = {}
+_chain_ids: Dict[str, int] = {}
+
+class TracedHTTPProvider(Web3.HTTPProvider):
+    """
+    HTTP provider that posts every JSON-RPC request through one shared session,
+    whichever thread makes it, and records each request as a span named after its method.
+
+    web3's own session manager keeps a session per thread, so Flask request threads,
+    ToolNode workers and the head follower would otherwise each open their own pool.
+
+    Args:
+        endpoint_uri (str): The JSON-RPC endpoint to connect to.
+        session (requests.Session): The pooled session all requests go through.
+    """
+
+    def __init__(self, endpoint_uri: str, session: requests.Session, **kwargs):
+        super().__init__(endpoint_uri, **kwargs)
+        self.session = session
+
+    def make_request(self, method, params):
+        with span("rpc", str(method)):
+            request_data = self.encode_rpc_request(method, params)
+            response = self.session.post(self.endpoint_uri, data=request_data, **dict(self.get_request_kwargs()))
+            response.raise_for_status()
+            return self.decode_rpc_response(response.content)
+
+def get_web3(rpc_url: str) -> Web3:
+    """
+    Return the shared Web3 instance for an RPC URL, creating it on first use.
+
+    No connectivity probe is made: connection errors surface from the first real
+    request instead of costing an extra round trip on every tool call.
+
+    Args:
+        rpc_url (str): The JSON-RPC endpoint to connect to.
+
+    Returns:
+        Web3: A Web3 instance backed by a pooled keep-alive session.
+    """
+    w3 = _providers.get(rpc_url)
+    if w3 is not None:
+        return w3
+
+    with _lock:
+        w3 = _providers.get(rpc_url)
+        if w3 is None:
+            session = build_http_session(constants.RPC_POOL_SIZE)
+            w3 = Web3(TracedHTTPProvider(
+                rpc_url,
+                session,
+                request_kwargs={"timeout": constants.RPC_TIMEOUT_SECONDS}
+            ))
+            _sessions[rpc_url] = session
+            _providers[rpc_url] = w3
+        return w3
+
+def get_session(rpc_url: str) -> requests.Session:
+    """
+    Return the pooled HTTP session used for an RPC URL.
+    """
+    get_web3(rpc_url)
+    return _sessions[rpc_url]
+
+def get_chain_id(rpc_url: str) -> int:
+    """
+    Return the chain id for an RPC URL, fetching it only once per process.
+    """
+    chain_id: Optional[int] = _chain_ids.get(rpc_url)
+    if chain_id is None:
+        chain_id = get_web3(rpc_url).eth.chain_id
+        _chain_ids[rpc_url] = chain_id
+    return chain_id
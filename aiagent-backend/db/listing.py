@@ -0,0 +1,66 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import constants
+
+# Cached listing pages keyed by listing name, then by (after, limit). The keys come
+# from query strings, so each listing keeps only its most recently used pages.
+_pages: Dict[str, "OrderedDict[Tuple[int, Optional[int]], Tuple[Dict[str, Any], str]]"] = {}
+_generations: Dict[str, int] = {}
+_lock = threading.Lock()
+
+def invalidate(name: str) -> None:
+    """
+    Drop every cached page of a listing. Called after writes to its table.
+    """
+    with _lock:
+        _pages.pop(name, None)
+        _generations[name] = _generations.get(name, 0) + 1
+
+def get_listing(
+    name: str,
+    fetch_page: Callable[[int, Optional[int]], List[Tuple[int, str]]],
+    after: int = 0,
+    limit: Optional[int] = None
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Return a keyset page of a listing and its ETag, served from memory until the table changes.
+
+    Args:
+        name (str): Listing name, also used as the key of the payload list.
+        fetch_page (Callable): Returns (id, contract) rows with id > after, at most limit rows.
+        after (int): Only include rows with an id greater than this.
+        limit (int, optional): Maximum number of rows; None returns every remaining row.
+
+    Returns:
+        Tuple[Dict[str, Any], str]: The response payload and its ETag.
+    """
+    key = (after, limit)
+    with _lock:
+        pages = _pages.get(name)
+        cached = pages.get(key) if pages else None
+        if cached:
+            pages.move_to_end(key)
+        generation = _generations.get(name, 0)
+    if cached:
+        return cached
+
+    rows = fetch_page(after, limit)
+    payload = {
+        name: [contract for _, contract in rows],
+        "next_after": rows[-1][0] if limit and len(rows) == limit else None
+    }
+    etag = hashlib.sha1(json.dumps(payload, separators=(",", ":")).encode()).hexdigest()
+
+    with _lock:
+        # Skip caching if a write invalidated the listing while we were reading
+        if _generations.get(name, 0) == generation:
+            pages = _pages.setdefault(name, OrderedDict())
+            pages[key] = (payload, etag)
+            pages.move_to_end(key)
+            while len(pages) > constants.LISTING_CACHE_PAGES:
+                pages.popitem(last=False)
+    return payload, etag
@@ -1,16 +1,18 @@
 import sqlite3
 import logging
+from db.storage import transaction, get_db_path
+from telemetry import traced
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@traced("db")
 def setup():
     """
     Initialize database with proper table schemas including primary keys
     and appropriate constraints.
     """
     try:
-        with sqlite3.connect("agent.db") as con:
+        with transaction() as con:
             cur = con.cursor()
             
             # Wallet table
@@ -36,9 +38,47 @@ def setup():
                     contract TEXT UNIQUE NOT NULL
                 )
             """)
-            
-            con.commit()
-            logger.info("Database tables created successfully")
+
+            # Conversation checkpoints
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoints(
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    type TEXT,
+                    checkpoint BLOB,
+                    metadata_type TEXT,
+                    metadata BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                )
+            """)
+
+            # Pending writes of conversation checkpoints
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoint_writes(
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    type TEXT,
+                    value BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                )
+            """)
+
+            # Last update of each conversation, used for TTL pruning
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoint_threads(
+                    thread_id TEXT PRIMARY KEY,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS checkpoint_threads_updated_at ON checkpoint_threads(updated_at)")
+
+        logger.info(f"Database tables created successfully at {get_db_path()}")
     except sqlite3.Error as e:
         logger.error(f"Failed to setup database: {str(e)}")
         raise
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+import logging
+
+import constants
+
+logger = logging.getLogger(__name__)
+
+# Default to the agent.db next to the backend sources rather than the current directory
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent.db")
+
+# One connection per thread, keyed by thread ident and tagged with its owning thread
+_connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+_lock = threading.Lock()
+
+def get_db_path() -> str:
+    """
+    Return the SQLite database path, configurable through AGENT_DB_PATH.
+    """
+    return os.getenv(constants.DB_PATH_ENV_VAR, DEFAULT_DB_PATH)
+
+def _connect() -> sqlite3.Connection:
+    """Open a connection tuned for concurrent readers and a single writer."""
+    con = sqlite3.connect(
+        get_db_path(),
+        timeout=constants.DB_BUSY_TIMEOUT_MS / 1000,
+        isolation_level=None,  # transactions are managed explicitly by transaction()
+        check_same_thread=False,  # only used by its owning thread, but closable from any
+        cached_statements=constants.DB_STATEMENT_CACHE_SIZE
+    )
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute(f"PRAGMA synchronous={constants.DB_SYNCHRONOUS}")
+    con.execute(f"PRAGMA busy_timeout={constants.DB_BUSY_TIMEOUT_MS}")
+    return con
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Return the calling thread's pooled connection, opening it on first use.
+
+    Statements run on the same connection reuse SQLite's prepared statement cache.
+    """
+    # Idents are reused once a thread exits, so the entry must belong to this very thread
+    entry = _connections.get(threading.get_ident())
+    if entry is not None and entry[0] is threading.current_thread():
+        return entry[1]
+
+    con = _connect()
+    with _lock:
+        # Close connections left behind by threads that have exited
+        for ident, (thread, stale) in list(_connections.items()):
+            if not thread.is_alive():
+                stale.close()
+                del _connections[ident]
+        _connections[threading.get_ident()] = (threading.current_thread(), con)
+    return con
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Run the enclosed statements in one transaction on the thread's connection.
+
+    Nested uses join the outer transaction, so callers can group several writes
+    into a single commit.
+    """
+    con = get_connection()
+    if con.in_transaction:
+        yield con
+        return
+
+    con.execute("BEGIN")
+    try:
+        yield con
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+
+def close_connections() -> None:
+    """
+    Close every pooled connection.
+    """
+    with _lock:
+        for _, con in _connections.values():
+            try:
+                con.close()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to close database connection: {str(e)}")
+        _connections.clear()
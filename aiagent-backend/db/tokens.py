@@ -1,30 +1,35 @@
 import sqlite3
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import logging
+from db.storage import get_connection, transaction
+from db.listing import invalidate
+from telemetry import traced
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+INSERT_SQL = "INSERT INTO erc20s(contract) VALUES (?)"
+SELECT_ALL_SQL = "SELECT contract FROM erc20s ORDER BY id"
+SELECT_PAGE_SQL = "SELECT id, contract FROM erc20s WHERE id > ? ORDER BY id LIMIT ?"
+
+@traced("db")
 def add_token(contract_address: str) -> bool:
     """
     Add a token to the database.
     Returns True if successful, False otherwise.
     """
     try:
-        with sqlite3.connect("agent.db") as con:
-            cur = con.cursor()
-            
+        with transaction() as con:
             # Try to insert the token
-            cur.execute("INSERT INTO erc20s(contract) VALUES (?)", (contract_address,))
-            con.commit()
-            
-            # Verify the insertion
-            if cur.rowcount > 0:
-                logger.info(f"Successfully added token: {contract_address}")
-                return True
-            else:
-                logger.warning(f"No rows were inserted for token: {contract_address}")
-                return False
+            cur = con.execute(INSERT_SQL, (contract_address,))
+
+        # Verify the insertion
+        if cur.rowcount > 0:
+            invalidate("tokens")
+            logger.info(f"Successfully added token: {contract_address}")
+            return True
+        else:
+            logger.warning(f"No rows were inserted for token: {contract_address}")
+            return False
                 
     except sqlite3.IntegrityError as e:
         logger.error(f"Token already exists or unique constraint failed: {str(e)}")
@@ -36,22 +41,28 @@ def add_token(contract_address: str) -> bool:
         logger.error(f"Unexpected error occurred: {str(e)}")
         return False
 
+@traced("db")
 def get_tokens() -> List[tuple]:
     """
     Retrieve all tokens from the database.
     Returns empty list if no tokens found or in case of error.
     """
     try:
-        with sqlite3.connect("agent.db") as con:
-            cur = con.cursor()
-            cur.execute("SELECT * FROM erc20s")
-            results = cur.fetchall()
+        results = get_connection().execute(SELECT_ALL_SQL).fetchall()
 
-            return [row[1] for row in results]
+        return [row[0] for row in results]
             
     except sqlite3.Error as e:
         logger.error(f"Failed to retrieve tokens: {str(e)}")
         return []
     except Exception as e:
         logger.error(f"Unexpected error while retrieving tokens: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+@traced("db")
+def get_tokens_page(after: int = 0, limit: Optional[int] = None) -> List[Tuple[int, str]]:
+    """
+    Retrieve (id, contract) rows with an id greater than `after`, using keyset pagination.
+    Returns at most `limit` rows, or every remaining row when limit is None.
+    """
+    return get_connection().execute(SELECT_PAGE_SQL, (after, -1 if limit is None else limit)).fetchall()
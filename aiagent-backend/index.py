@@ -1,14 +1,19 @@
+import os
 from flask import Flask, request, Response, stream_with_context, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
-from agent.initialize_agent import initialize_agent
-from agent.run_agent import run_agent
+from agent.warmup import AgentWarmup
 from db.setup import setup
-from db.tokens import get_tokens
-from db.nfts import get_nfts
+from db.tokens import get_tokens_page
+from db.nfts import get_nfts_page
+from db.listing import get_listing
+from telemetry import configure_logging, registry
+import constants
 
 load_dotenv()
+# Route every module's logging through the queue-backed structured logger
+configure_logging()
 app = Flask(__name__)
 # add cors to allow cross origin requests
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -16,9 +21,30 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 # Setup SQLite tables
 setup()
 
-# Initialize the agent
-agent_executor = initialize_agent()
-app.agent_executor = agent_executor
+# Initialize the agent in the background; /ready reports when it can serve chats.
+# Assign app.agent_executor to serve with a prebuilt executor instead, with
+# AGENT_WARMUP=0 so no agent is initialized at import.
+app.agent_executor = None
+app.agent_warmup = AgentWarmup()
+if os.getenv(constants.AGENT_WARMUP_ENV_VAR, "1") != "0":
+    app.agent_warmup.start()
+
+def get_agent_executor():
+    """
+    Return the agent executor, waiting a bounded time for the warm-up to finish.
+    """
+    if app.agent_executor is not None:
+        return app.agent_executor
+    app.agent_warmup.start()
+    return app.agent_warmup.wait(constants.AGENT_READY_TIMEOUT_SECONDS)
+
+# Readiness probe for load balancers: 200 once the agent can serve chats, 503 before
+@app.route("/ready", methods=['GET'])
+def ready():
+    status = app.agent_warmup.status()
+    if app.agent_executor is not None:
+        status['state'] = 'ready'
+    return jsonify(status), 200 if status['state'] == 'ready' else 503
 
 # Interact with the agent
 @app.route("/api/chat", methods=['POST'])
@@ -29,13 +55,22 @@ def chat():
         input = data['input']
         # Use the conversation_id passed in the request for conversation memory
         config = {"configurable": {"thread_id": data['conversation_id']}}
+        # Opt in to token-level streaming of partial agent messages
+        stream_tokens = bool(data.get('stream_tokens', False))
+        agent_executor = get_agent_executor()
+        if agent_executor is None:
+            return jsonify({'error': 'Agent is not ready'}), 503, {'Retry-After': '5'}
+
+        from agent.run_agent import run_agent
         return Response(
-            stream_with_context(run_agent(input, app.agent_executor, config)),
+            stream_with_context(run_agent(input, agent_executor, config, stream_tokens)),
             mimetype='text/event-stream',
+            # No Connection header: it is hop-by-hop and left to the WSGI server. The
+            # werkzeug server closes every connection, and a keep-alive header here
+            # made clients reuse a connection the server had already given up.
             headers={
                 'Cache-Control': 'no-cache',
                 'Content-Type': 'text/event-stream',
-                'Connection': 'keep-alive',
                 'X-Accel-Buffering': 'no'
             }
         )
@@ -43,12 +78,25 @@ def chat():
         app.logger.error(f"Unexpected error in chat endpoint: {str(e)}")
         return jsonify({'error': 'An unexpected error occurred'}), 500
 
+def listing_response(name, fetch_page):
+    """
+    Serve a cached keyset page (?after=<id>&limit=) of a listing, answering 304 when the ETag matches.
+    """
+    after = request.args.get('after', default=0, type=int)
+    limit = request.args.get('limit', default=None, type=int)
+    if limit is not None:
+        limit = max(1, min(limit, constants.LISTING_MAX_LIMIT))
+
+    payload, etag = get_listing(name, fetch_page, after, limit)
+    response = jsonify(payload)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
 # Retrieve a list of tokens the agent has deployed
 @app.route("/tokens", methods=['GET'])
 def tokens():
     try:
-        tokens = get_tokens()
-        return jsonify({'tokens': tokens}), 200
+        return listing_response('tokens', get_tokens_page)
     except Exception as e:
         app.logger.error(f"Unexpected error in tokens endpoint: {str(e)}")
         return jsonify({'error': 'An unexpected error occurred'}), 500
@@ -57,13 +105,17 @@ def tokens():
 @app.route("/nfts", methods=['GET'])
 def nfts():
     try:
-        nfts = get_nfts()
-        return jsonify({'nfts': nfts}), 200
+        return listing_response('nfts', get_nfts_page)
     except Exception as e:
         app.logger.error(f"Unexpected error in nfts endpoint: {str(e)}")
         return jsonify({'error': 'An unexpected error occurred'}), 500
 
 
+# Prometheus metrics: span latency histograms, chat counters, cache and queue stats
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(registry.render(), content_type=constants.METRICS_CONTENT_TYPE)
+
 @app.route("/", methods=["GET"])
 def index():
     return "AI Agent Backend"
@@ -1,9 +1,14 @@
-from .client import OneInchClient, NetworkEnum
+from .client import OneInchClient, NetworkEnum, get_client
+from .transport import HttpTransport
+from .quote_cache import QuoteCache
 from .actions import swap_tokens, get_quote, fetch_active_orders
 
 __all__ = [
     'OneInchClient',
     'NetworkEnum',
+    'get_client',
+    'HttpTransport',
+    'QuoteCache',
     'swap_tokens',
     'get_quote',
     'fetch_active_orders'
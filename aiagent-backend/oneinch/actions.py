@@ -1,19 +1,20 @@
+import logging
 import os
 import json
-from typing import Any, Dict
-from .client import OneInchClient  # Ensure correct import
+from typing import Any, Dict, Optional
+from .client import get_client
 
-client = OneInchClient()
+logger = logging.getLogger(__name__)
 
 def swap_tokens(from_token: str, to_token: str, amount: int, recipient: str, slippage: float = 100) -> Dict[str, Any]:
     """
     Swap tokens using OneInchClient.
     """
     try:
-        result = client.swap_tokens(from_token, to_token, amount, recipient, slippage)
+        result = get_client().swap_tokens(from_token, to_token, amount, recipient, slippage)
         return result if result else {}
     except Exception as e:
-        print(f"Error in swap_tokens action: {e}")
+        logger.error("Error in swap_tokens action: %s", e)
         return {}
 
 def get_quote(src_chain: int, dst_chain: int, from_token: str, to_token: str, amount: int) -> Dict[str, Any]:
@@ -21,7 +22,7 @@ def get_quote(src_chain: int, dst_chain: int, from_token: str, to_token: str, am
     Fetch quote details from the OneInchClient.
     """
     try:
-        quote = client.get_quote(
+        quote = get_client().get_quote(
             src_chain=src_chain,
             dst_chain=dst_chain,
             from_token=from_token,
@@ -30,16 +31,17 @@ def get_quote(src_chain: int, dst_chain: int, from_token: str, to_token: str, am
         )
         return quote if quote else {}
     except Exception as e:
-        print(f"Error in get_quote action: {e}")
+        logger.error("Error in get_quote action: %s", e)
         return {}
 
-def fetch_active_orders() -> Dict[str, Any]:
+def fetch_active_orders(since: Optional[str] = None) -> Dict[str, Any]:
     """
-    Fetch active orders from the OneInchClient.
+    Fetch active orders from the OneInchClient, returning only those added, changed
+    or removed since the `since` cursor (every active order by default).
     """
     try:
-        orders = client.fetch_active_orders()
+        orders = get_client().fetch_active_orders(since)
         return orders if orders else {}
     except Exception as e:
-        print(f"Error in fetch_active_orders action: {e}")
+        logger.error("Error in fetch_active_orders action: %s", e)
         return {}
@@ -0,0 +1,102 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+class ActiveOrdersSnapshot:
+    """
+    Local copy of the active order book that reports what changed between refreshes.
+
+    Every refresh that changes the book bumps `version`. Orders remember the version
+    at which they were added and last changed, and removed orders leave a bounded
+    tombstone, so any earlier version can be used as a cursor to get a diff. Cursors
+    belong to the caller; the snapshot keeps none of its own, so conversations
+    sharing it don't consume each other's changes.
+
+    Cursors are "<epoch>-<version>" strings. The epoch is new for every snapshot, so a
+    cursor kept in a conversation across a restart is recognized as unknown and
+    answered with a full listing instead of an empty diff.
+    """
+
+    def __init__(self, tombstone_limit: int = 1000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.tombstone_limit = tombstone_limit
+
+        # orderHash -> (added_version, updated_version, order)
+        self._orders: Dict[str, tuple] = {}
+        # orderHash -> (added_version, removed_version)
+        self._removed: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _parse_cursor(self, cursor: Any) -> int:
+        """Version named by a cursor of this snapshot; 0 for none, another epoch, or the future."""
+        epoch, _, version = str(cursor or "").partition("-")
+        if epoch != self.epoch or not version.isdigit():
+            return 0
+        version = int(version)
+        return version if version <= self.version else 0
+
+    def refresh(self, orders: Iterable[Dict[str, Any]], since: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Apply a full walk of the active orders and return the diff since a cursor.
+
+        The walk is consumed before anything is applied, so an error part-way through
+        leaves the snapshot untouched.
+
+        Args:
+            orders (Iterable[Dict[str, Any]]): Every currently active order.
+            since (str, optional): Cursor from a previous result. Without one, or with a
+                cursor this snapshot doesn't know, every active order is listed.
+
+        Returns:
+            Dict[str, Any]: The new cursor, the total number of active orders, whether this
+            is a full listing, and the orders added, changed and removed since `since`.
+        """
+        current = {order["orderHash"]: order for order in orders if order.get("orderHash")}
+
+        with self._lock:
+            since_version = self._parse_cursor(since)
+            version = self.version + 1
+            updated = False
+
+            for order_hash, order in current.items():
+                existing = self._orders.get(order_hash)
+                if existing is None:
+                    self._orders[order_hash] = (version, version, order)
+                    self._removed.pop(order_hash, None)
+                    updated = True
+                elif existing[2] != order:
+                    self._orders[order_hash] = (existing[0], version, order)
+                    updated = True
+
+            for order_hash in [h for h in self._orders if h not in current]:
+                self._removed[order_hash] = (self._orders[order_hash][0], version)
+                del self._orders[order_hash]
+                updated = True
+
+            while len(self._removed) > self.tombstone_limit:
+                self._removed.popitem(last=False)
+
+            if updated:
+                self.version = version
+
+            added, changed = [], []
+            for added_version, updated_version, order in self._orders.values():
+                if added_version > since_version:
+                    added.append(order)
+                elif updated_version > since_version:
+                    changed.append(order)
+
+            return {
+                "cursor": f"{self.epoch}-{self.version}",
+                "total": len(self._orders),
+                "full_listing": since_version == 0,
+                "added": added,
+                "changed": changed,
+                # Only orders that were active at the cursor can have been removed since
+                "removed": [
+                    order_hash for order_hash, (added_version, removed_version) in self._removed.items()
+                    if added_version <= since_version < removed_version
+                ]
+            }
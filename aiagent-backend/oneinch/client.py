@@ -1,14 +1,22 @@
+import copy
+import logging
 import os
-import requests
 import constants
-from typing import Any, Dict, List, Optional
-from web3 import Web3
+from typing import Any, Dict, Iterator, List, Optional
 from eth_account import Account
 import random
-import time
 from eth_account.messages import encode_typed_data
 import json
+import threading
 from db.wallet import get_wallet_info, add_wallet_info
+from chain.provider import get_web3
+from telemetry import add_secret, registry
+from .transport import HttpTransport
+from .quote_cache import QuoteCache
+from .order_tracker import OrderTracker
+from .active_orders import ActiveOrdersSnapshot
+
+logger = logging.getLogger(__name__)
 
 class NetworkEnum:
     ETHEREUM = 1
@@ -17,37 +25,95 @@ class NetworkEnum:
     BASE_SEPOLIA = 84532
 
 class OneInchClient:
-    def __init__(self, private_key: Optional[str] = None):
+    def __init__(self, private_key: Optional[str] = None, transport: Optional[HttpTransport] = None):
         """
         Initialize the OneInchClient.
+
+        Args:
+            private_key (str, optional): Wallet private key; falls back to WALLET_PRIVATE_KEY.
+            transport (HttpTransport, optional): HTTP transport; a pooled one is built from the environment by default.
         """
+        # Web3 and the signing account are built on first use
+        self._w3 = None
+        self._account = None
+        self._address: Optional[str] = None
+        self._lazy_lock = threading.Lock()
+
         try:
-            self.base_url = "https://api.1inch.dev"
+            self.base_url = os.getenv(constants.ONEINCH_API_URL_ENV_VAR, constants.ONEINCH_API_URL).rstrip("/")
             self.fusion_plus_url = f"{self.base_url}/fusion-plus"
             self.api_version = "v1.0"
 
-            web3_provider = os.getenv("WEB3_PROVIDER_URL", "https://sepolia.base.org")
-            self.w3 = Web3(Web3.HTTPProvider(web3_provider))
+            self.web3_provider = os.getenv("WEB3_PROVIDER_URL", constants.BASE_SEPOLIA_RPC_URL)
             self.api_key = os.getenv("ONEINCH_API_KEY", "")
             self.private_key = private_key or os.getenv("WALLET_PRIVATE_KEY")
+            self.transport = transport or HttpTransport(
+                self._get_headers(),
+                pool_size=int(os.getenv(constants.ONEINCH_POOL_SIZE_ENV_VAR, constants.ONEINCH_POOL_SIZE)),
+                timeout=float(os.getenv(constants.ONEINCH_TIMEOUT_ENV_VAR, constants.ONEINCH_TIMEOUT_SECONDS)),
+                max_retries=int(os.getenv(constants.ONEINCH_MAX_RETRIES_ENV_VAR, constants.ONEINCH_MAX_RETRIES))
+            )
+            self._order_tracker: Optional[OrderTracker] = None
+            self.active_orders = ActiveOrdersSnapshot()
+            self.quote_cache = QuoteCache(
+                ttl=float(os.getenv(constants.ONEINCH_QUOTE_TTL_ENV_VAR, constants.ONEINCH_QUOTE_TTL_SECONDS))
+            )
 
             # Load wallet info from the database
             # self.load_wallet_info()
+        except Exception as e:
+            logger.error("Init error: %s", e)
 
-            if not self.private_key:
-                self.account = Account.create()
-                self.address = self.account.address
-                self.private_key = self.account.key.hex()
-            else:
-                self.account = Account.from_key(self.private_key)
-                self.address = self.account.address
+    @property
+    def w3(self):
+        """
+        Web3 instance for the configured provider, created on first use.
+        """
+        if self._w3 is None:
+            self._w3 = get_web3(self.web3_provider)
+        return self._w3
 
-            print(f"Initialized with address: {self.address}")
-        except Exception as e:
-            print(f"Init error: {e}")
-            self.w3 = None
-            self.account = None
-            self.address = None
+    @property
+    def account(self):
+        """
+        Signing account, created on first use from the private key, or freshly generated
+        when no key is configured.
+        """
+        if self._account is None:
+            with self._lazy_lock:
+                if self._account is None:
+                    if self.private_key:
+                        self._account = Account.from_key(self.private_key)
+                    else:
+                        account = Account.create()
+                        self.private_key = account.key.hex()
+                        self._account = account
+                    add_secret(self.private_key)
+                    logger.info("Initialized with address: %s", self._account.address)
+        return self._account
+
+    @account.setter
+    def account(self, account):
+        self._account = account
+
+    @property
+    def address(self) -> Optional[str]:
+        if self._address is None and self.account is not None:
+            self._address = self.account.address
+        return self._address
+
+    @address.setter
+    def address(self, address: Optional[str]):
+        self._address = address
+
+    @property
+    def order_tracker(self) -> OrderTracker:
+        """
+        Background tracker for orders created by this client, started on first use.
+        """
+        if self._order_tracker is None:
+            self._order_tracker = OrderTracker(self)
+        return self._order_tracker
 
     def _save_wallet_info(self):
         """
@@ -67,7 +133,8 @@ class OneInchClient:
             # Read wallet data from environment variable or database
             wallet_id = os.getenv(constants.WALLET_ID_ENV_VAR)
             wallet_seed = os.getenv(constants.WALLET_SEED_ENV_VAR)
-            wallet_info = json.loads(get_wallet_info()) if get_wallet_info() else None
+            stored_wallet_info = get_wallet_info()
+            wallet_info = json.loads(stored_wallet_info) if stored_wallet_info else None
 
             # Configure CDP Agentkit Langchain Extension.
             values = {}
@@ -86,15 +153,15 @@ class OneInchClient:
 
             if self.private_key:
                 self.account = Account.from_key(self.private_key)
-                print(f"Loaded wallet info for address: {self.address}")
+                logger.info("Loaded wallet info for address: %s", self.address)
             else:
-                print("No wallet info found in the database.")
+                logger.warning("No wallet info found in the database.")
         except Exception as e:
-            print(f"Load wallet info error: {e}")
+            logger.error("Load wallet info error: %s", e)
 
     def _get_headers(self) -> Dict[str, str]:
         """
-        Get headers for API requests.
+        Get headers for API requests. Called once to configure the transport session.
         """
         try:
             return {
@@ -103,7 +170,7 @@ class OneInchClient:
                 "Content-Type": "application/json"
             }
         except Exception as e:
-            print(f"Headers error: {e}")
+            logger.error("Headers error: %s", e)
             return {}
 
     def _sign_typed_data(self, data: Dict) -> str:
@@ -119,34 +186,45 @@ class OneInchClient:
             signature = self.account.sign_message(signable_message)
             return signature.signature.hex()
         except Exception as e:
-            print(f"Signing error: {e}")
+            logger.error("Signing error: %s", e)
             return ""
 
     def get_quote(self, src_chain: int, dst_chain: int, from_token: str, to_token: str, amount: int, enable_estimate: bool = True) -> Dict[str, Any]:
         """
         Get quote details based on input data.
+
+        Identical quotes requested within the cache TTL are served from the quote cache,
+        and concurrent identical requests share one upstream call. Each caller gets its
+        own deep copy, so mutating a quote never reaches the cache.
         """
         try:
-            url = f"{self.fusion_plus_url}/quoter/{self.api_version}/quote/receive"
-            params = {
-                "srcChain": src_chain,
-                "dstChain": dst_chain,
-                "srcTokenAddress": from_token,
-                "dstTokenAddress": to_token,
-                "amount": str(amount),
-                "walletAddress": self.address,
-                "enableEstimate": str(enable_estimate).lower()
-            }
-            response = requests.get(
-                url,
-                headers=self._get_headers(),
-                params=params
+            key = (src_chain, dst_chain, from_token.lower(), to_token.lower(), str(amount), self.address, enable_estimate)
+            quote = self.quote_cache.get_or_fetch(
+                key,
+                lambda: self._fetch_quote(src_chain, dst_chain, from_token, to_token, amount, enable_estimate)
             )
-            return response.json() if response.ok else {}
+            return copy.deepcopy(quote)
         except Exception as e:
-            print(f"Quote error: {e}")
+            logger.error("Quote error: %s", e)
             return {}
 
+    def _fetch_quote(self, src_chain: int, dst_chain: int, from_token: str, to_token: str, amount: int, enable_estimate: bool) -> Dict[str, Any]:
+        """
+        Fetch a quote from the 1inch quoter API.
+        """
+        url = f"{self.fusion_plus_url}/quoter/{self.api_version}/quote/receive"
+        params = {
+            "srcChain": src_chain,
+            "dstChain": dst_chain,
+            "srcTokenAddress": from_token,
+            "dstTokenAddress": to_token,
+            "amount": str(amount),
+            "walletAddress": self.address,
+            "enableEstimate": str(enable_estimate).lower()
+        }
+        response = self.transport.get(url, params=params)
+        return response.json() if response.ok else {}
+
     def swap_tokens(self, from_token: str, to_token: str, amount: int, recipient: str, slippage: float) -> Dict[str, Any]:
         """
         Swap tokens using OneInchClient.
@@ -160,19 +238,18 @@ class OneInchClient:
                 "slippage": slippage
             }
             url = f"{self.fusion_plus_url}/swap/{self.api_version}"
-            response = requests.post(
-                url,
-                headers=self._get_headers(),
-                json=params
-            )
+            response = self.transport.post(url, json=params)
             return response.json() if response.ok else {}
         except Exception as e:
-            print(f"Swap tokens error: {e}")
+            logger.error("Swap tokens error: %s", e)
             return {}
 
     def create_order(self, quote_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create an order using a quote.
+
+        Created orders are registered with the order tracker, which polls their status
+        and submits the secret once the order is ready.
         """
         try:
             secret = "0x" + hex(random.getrandbits(256))[2:].zfill(64)
@@ -184,15 +261,16 @@ class OneInchClient:
                 **params
             }
 
-            response = requests.post(url, headers=self._get_headers(), json=payload)
+            response = self.transport.post(url, json=payload)
             result = response.json() if response.ok else {}
 
             if result.get("orderHash"):  # Store secret if order created
                 result["secret"] = secret
+                self.order_tracker.track(result["orderHash"], secret)
 
             return result
         except Exception as e:
-            print(f"Create order error: {e}")
+            logger.error("Create order error: %s", e)
             return {}
 
     def get_order_status(self, order_hash: str) -> Dict[str, Any]:
@@ -201,14 +279,26 @@ class OneInchClient:
         """
         try:
             url = f"{self.fusion_plus_url}/orders/{self.api_version}/status"
-            response = requests.get(
-                url,
-                headers=self._get_headers(),
-                params={"orderHash": order_hash}
-            )
+            response = self.transport.get(url, params={"orderHash": order_hash})
             return response.json() if response.ok else {}
         except Exception as e:
-            print(f"Status error: {e}")
+            logger.error("Status error: %s", e)
+            return {}
+
+    def get_orders_status(self, order_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the status of several orders in one request, keyed by order hash.
+        """
+        try:
+            url = f"{self.fusion_plus_url}/orders/{self.api_version}/status"
+            response = self.transport.post(url, json={"orderHashes": order_hashes}, idempotent=True)
+            if not response.ok:
+                return {}
+            data = response.json()
+            items = data if isinstance(data, list) else data.get("orders", [])
+            return {item["orderHash"]: item for item in items if item.get("orderHash")}
+        except Exception as e:
+            logger.error("Batch status error: %s", e)
             return {}
 
     def submit_secret(self, order_hash: str, secret: str) -> Dict[str, Any]:
@@ -221,12 +311,68 @@ class OneInchClient:
                 "orderHash": order_hash,
                 "secret": secret
             }
-            response = requests.post(url, headers=self._get_headers(), json=payload)
+            response = self.transport.post(url, json=payload)
             return response.json() if response.ok else {}
         except Exception as e:
-            print(f"Submit secret error: {e}")
+            logger.error("Submit secret error: %s", e)
+            return {}
+
+    def iter_active_orders(self, page_size: int = constants.ONEINCH_ACTIVE_ORDERS_PAGE_SIZE, src_chain: Optional[int] = None, dst_chain: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily walk the paginated active orders endpoint, yielding one order at a time.
+
+        Raises on a failed page so callers never mistake a partial walk for the full book.
+        """
+        url = f"{self.fusion_plus_url}/orders/{self.api_version}/order/active"
+        page = 1
+        while True:
+            params = {"page": page, "limit": page_size}
+            if src_chain is not None:
+                params["srcChain"] = src_chain
+            if dst_chain is not None:
+                params["dstChain"] = dst_chain
+
+            response = self.transport.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+
+            items = data.get("items", [])
+            yield from items
+
+            total_pages = data.get("meta", {}).get("totalPages", page)
+            if not items or page >= total_pages:
+                return
+            page += 1
+
+    def fetch_active_orders(self, since: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch active orders, returning only those added, changed or removed since a cursor.
+
+        Args:
+            since (str, optional): Cursor from a previous result. Without one, or with a
+                cursor from before a restart, every active order is returned.
+        """
+        try:
+            return self.active_orders.refresh(self.iter_active_orders(), since)
+        except Exception as e:
+            logger.error("Active orders error: %s", e)
             return {}
 
+_client: Optional[OneInchClient] = None
+_client_lock = threading.Lock()
+
+def get_client() -> OneInchClient:
+    """
+    Return the process-wide OneInchClient, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OneInchClient()
+                registry.register_stats("oneinch_quote_cache", _client.quote_cache.stats)
+    return _client
+
 def test_client():
     """
     Test the OneInchClient functionality.
@@ -258,20 +404,9 @@ def test_client():
             if order.get("orderHash"):
                 print(f"Order created: {order['orderHash']}")
 
-                # Poll status 3 times
-                for i in range(3):
-                    status = client.get_order_status(order["orderHash"])
-                    print(f"Status {i+1}: {status.get('status', 'unknown')}")
-                    time.sleep(2)
-
-                    if status.get("status") == "ready":
-                        print("Submitting secret...")
-                        result = client.submit_secret(
-                            order["orderHash"],
-                            order["secret"]
-                        )
-                        print(f"Secret submitted: {result}")
-                        break
+                # The order tracker polls the status and submits the secret when ready
+                status = client.order_tracker.wait(order["orderHash"], timeout=60)
+                print(f"Order status: {status}")
             else:
                 print("Order creation failed")
         else:
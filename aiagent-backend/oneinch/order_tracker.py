@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import constants
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which an order no longer needs polling
+TERMINAL_STATUSES = {"executed", "expired", "cancelled", "refunded"}
+
+class TrackedOrder:
+    """Polling state for one open Fusion+ order."""
+
+    def __init__(self, order_hash: str, secret: str, interval: float):
+        self.order_hash = order_hash
+        self.secret = secret
+        self.interval = interval
+        self.tracked_at = time.monotonic()
+        self.next_poll = self.tracked_at + interval
+        self.status: Optional[str] = None
+        self.secret_submitted = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "orderHash": self.order_hash,
+            "status": self.status,
+            "secretSubmitted": self.secret_submitted
+        }
+
+class OrderTracker:
+    """
+    Track open Fusion+ orders on a background thread.
+
+    Due orders are checked together in batched status requests. Polling starts at
+    `min_interval`, slows down by `backoff` while an order's status is unchanged
+    (up to `max_interval`) and speeds up again when it changes. When an order
+    becomes ready its secret is submitted automatically.
+
+    Orders whose status is missing from a batch response are looked up one by one.
+    An order still open after `max_age` seconds is dropped with status "untracked",
+    whatever its status, so orders that never report a terminal status (or stay ready
+    while their secret is rejected) don't stay in the poll set forever. A batch that
+    fails is logged and backed off like an unchanged one; it never stops the thread.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        batch_size: int = 50,
+        history_size: int = 1000,
+        max_age: float = 6 * 60 * 60
+    ):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.history_size = history_size
+        self.max_age = max_age
+
+        self._orders: Dict[str, TrackedOrder] = {}
+        self._finished: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def track(self, order_hash: str, secret: str) -> None:
+        """Start tracking an order returned by create_order."""
+        with self._cond:
+            self._orders[order_hash] = TrackedOrder(order_hash, secret, self.min_interval)
+            self._stopped = False
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="oneinch-order-tracker", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def status(self, order_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the last known state of a tracked or finished order."""
+        with self._cond:
+            order = self._orders.get(order_hash)
+            if order:
+                return order.to_dict()
+            return self._finished.get(order_hash)
+
+    def open_orders(self) -> List[Dict[str, Any]]:
+        """Return the state of every order still being tracked."""
+        with self._cond:
+            return [order.to_dict() for order in self._orders.values()]
+
+    def wait(self, order_hash: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until an order reaches a terminal status or the timeout expires."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while order_hash in self._orders:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return self.status(order_hash)
+
+    def stop(self) -> None:
+        """Stop the polling thread."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if not self._orders:
+                        self._cond.wait()
+                        continue
+                    delay = min(order.next_poll for order in self._orders.values()) - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                due = [order.order_hash for order in self._orders.values() if order.next_poll <= now]
+
+            for i in range(0, len(due), self.batch_size):
+                batch = due[i:i + self.batch_size]
+                try:
+                    self._poll(batch)
+                except Exception as e:
+                    # Sampled, as a failing endpoint would otherwise log every poll
+                    logger.error("Order tracker error: %s", e, extra={"sample_rate": constants.LOG_ERROR_SAMPLE_RATE})
+                    self._back_off(batch)
+
+    def _poll(self, order_hashes: List[str]) -> None:
+        """Check a batch of orders and act on their new statuses."""
+        statuses = self.client.get_orders_status(order_hashes)
+        if not isinstance(statuses, dict):
+            statuses = {}
+        for order_hash in order_hashes:
+            # The batch endpoint may be unavailable or leave orders out
+            if not statuses.get(order_hash):
+                statuses[order_hash] = self.client.get_order_status(order_hash)
+
+        ready: List[TrackedOrder] = []
+        now = time.monotonic()
+        with self._cond:
+            for order_hash in order_hashes:
+                order = self._orders.get(order_hash)
+                if not order:
+                    continue
+                response = statuses.get(order_hash)
+                status = response.get("status") if isinstance(response, dict) else None
+                if status and status != order.status:
+                    order.status = status
+                    order.interval = self.min_interval
+                else:
+                    order.interval = min(order.interval * self.backoff, self.max_interval)
+                order.next_poll = time.monotonic() + order.interval
+
+                if status in TERMINAL_STATUSES:
+                    self._finish(order)
+                elif now - order.tracked_at > self.max_age:
+                    logger.warning("Stopped tracking order %s after %ds, last status: %s",
+                                   order_hash, self.max_age, order.status)
+                    order.status = "untracked"
+                    self._finish(order)
+                elif status == "ready" and not order.secret_submitted:
+                    ready.append(order)
+
+        # Submit secrets outside the lock so a slow call never stalls readers
+        for order in ready:
+            try:
+                result = self.client.submit_secret(order.order_hash, order.secret)
+            except Exception as e:
+                logger.error("Secret submission failed for order %s: %s", order.order_hash, e)
+                continue
+            if result:
+                with self._cond:
+                    order.secret_submitted = True
+
+    def _back_off(self, order_hashes: List[str]) -> None:
+        """Push back the next poll of orders whose batch failed."""
+        with self._cond:
+            for order_hash in order_hashes:
+                order = self._orders.get(order_hash)
+                if order:
+                    order.interval = min(order.interval * self.backoff, self.max_interval)
+                    order.next_poll = time.monotonic() + order.interval
+
+    def _finish(self, order: TrackedOrder) -> None:
+        """Move an order to the finished history. Caller must hold the lock."""
+        self._orders.pop(order.order_hash, None)
+        self._finished[order.order_hash] = order.to_dict()
+        while len(self._finished) > self.history_size:
+            self._finished.popitem(last=False)
+        self._cond.notify_all()
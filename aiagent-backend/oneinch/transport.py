@@ -0,0 +1,108 @@
+import random
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import requests
+
+from telemetry import span
+from utils import build_http_session
+
+class HttpTransport:
+    """
+    Pooled HTTP transport for the 1inch API with per-call timeouts and retries.
+
+    Requests reuse keep-alive connections from a session whose headers are set once.
+    429 responses are retried for every method; 5xx responses and dropped connections
+    are only retried for idempotent requests so an order or swap is never sent twice.
+    """
+
+    RETRY_STATUSES = {500, 502, 503, 504}
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        pool_size: int = 10,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0
+    ):
+        self.session = build_http_session(pool_size)
+        self.session.headers.update(headers)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honoring a numeric Retry-After header."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None
+    ) -> requests.Response:
+        """
+        Send a request, retrying throttled and transient failures.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            params (Dict[str, Any], optional): Query string parameters.
+            json (Any, optional): JSON body.
+            timeout (float, optional): Per-call timeout in seconds; defaults to the transport timeout.
+            idempotent (bool, optional): Whether 5xx and connection errors may be retried. Defaults to True for GET.
+
+        Returns:
+            requests.Response: The final response.
+        """
+        if idempotent is None:
+            idempotent = method.upper() == "GET"
+
+        # One span per logical call, retries and backoff included
+        with span("oneinch_http", f"{method.upper()} {urlsplit(url).path}"):
+            return self._send(method, url, params, json, timeout, idempotent)
+
+    def _send(self, method: str, url: str, params: Optional[Dict[str, Any]], json: Optional[Any], timeout: Optional[float], idempotent: bool) -> requests.Response:
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    timeout=timeout or self.timeout
+                )
+            except requests.ConnectTimeout:
+                # The request never reached the server, so it is always safe to retry
+                if attempt >= self.max_retries:
+                    raise
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in self.RETRY_STATUSES)
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        return self.request("GET", url, params=params, **kwargs)
+
+    def post(self, url: str, json: Optional[Any] = None, **kwargs) -> requests.Response:
+        return self.request("POST", url, json=json, **kwargs)
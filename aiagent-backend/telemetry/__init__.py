@@ -0,0 +1,18 @@
+from .metrics import Counter, Histogram, Registry, registry
+from .log import add_secret, configure_logging, redact
+from .tracing import conversation_context, get_conversation_id, record_span, span, traced
+
+__all__ = [
+    'Counter',
+    'Histogram',
+    'Registry',
+    'registry',
+    'add_secret',
+    'configure_logging',
+    'redact',
+    'conversation_context',
+    'get_conversation_id',
+    'record_span',
+    'span',
+    'traced'
+]
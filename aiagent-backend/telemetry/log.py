@@ -0,0 +1,236 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+import constants
+from telemetry.metrics import registry
+from telemetry.tracing import get_conversation_id
+
+REDACTED = "[REDACTED]"
+
+# Values following these keys are redacted wherever they appear in a message
+SENSITIVE_KEYS = ("seed", "private_key", "privatekey", "secret", "api_key", "apikey", "password", "mnemonic", "authorization")
+_KEY_VALUE_PATTERN = re.compile(
+    r"""(?i)((?:%s)["']?\s*[:=]\s*)(?!\[REDACTED\])("[^"]*"|'[^']*'|[^\s,;}\]]+)""" % "|".join(SENSITIVE_KEYS)
+)
+_BEARER_PATTERN = re.compile(r"(?i)\bBearer\s+[A-Za-z0-9._~+/=-]+")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "conversation_id", "sample_rate"}
+
+_secrets: Set[str] = set()
+_secrets_pattern: Optional[re.Pattern] = None
+_secrets_lock = threading.Lock()
+
+def add_secret(value: Optional[str]) -> None:
+    """
+    Redact a secret value, such as a wallet seed, from every log line from now on.
+
+    Values shorter than LOG_SECRET_MIN_LENGTH are ignored, and secrets only match as
+    whole tokens, so a short or common value can't mangle unrelated text.
+    """
+    global _secrets_pattern
+    if not value or len(value) < constants.LOG_SECRET_MIN_LENGTH:
+        return
+    with _secrets_lock:
+        _secrets.add(value)
+        # Longest first, so a secret containing another is masked whole
+        alternatives = "|".join(re.escape(secret) for secret in sorted(_secrets, key=len, reverse=True))
+        _secrets_pattern = re.compile(rf"(?<![A-Za-z0-9_])(?:{alternatives})(?![A-Za-z0-9_])")
+
+def redact(text: str) -> str:
+    """
+    Mask registered secrets, Bearer tokens and values of sensitive keys in a string.
+    """
+    secrets_pattern = _secrets_pattern
+    if secrets_pattern is not None:
+        text = secrets_pattern.sub(REDACTED, text)
+    text = _BEARER_PATTERN.sub(f"Bearer {REDACTED}", text)
+    return _KEY_VALUE_PATTERN.sub(lambda match: match.group(1) + REDACTED, text)
+
+def _redact_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return redact(value)
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if any(name in str(key).lower() for name in SENSITIVE_KEYS) else _redact_value(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_redact_value(item) for item in value]
+    return value
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line (or plain text), with secrets redacted.
+
+    JSON lines carry the timestamp, level, logger, message, conversation id and any
+    fields passed through `extra`.
+    """
+
+    def __init__(self, json_output: bool = True):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        self.json_output = json_output
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if not self.json_output:
+            record.message = redact(message)
+            record.asctime = self.formatTime(record)
+            text = self.formatMessage(record)
+            if record.exc_text:
+                text = f"{text}\n{redact(record.exc_text)}"
+            return text
+
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(message),
+        }
+        conversation_id = getattr(record, "conversation_id", None)
+        if conversation_id is not None:
+            entry["conversation_id"] = conversation_id
+        sample_rate = getattr(record, "sample_rate", None)
+        if sample_rate is not None:
+            entry["sample_rate"] = sample_rate
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = _redact_value(value)
+        if record.exc_text:
+            entry["exception"] = redact(record.exc_text)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every 1/rate records of high-frequency events.
+
+    The rate comes from `extra={"sample_rate": ...}` on the call, or from the per-logger
+    rates for records below WARNING. Records are counted per logger and message
+    template, so a burst of one event doesn't crowd out others.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rates = rates or {}
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def _logger_rate(self, name: str) -> Optional[float]:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample_rate", None)
+        if rate is None and record.levelno < logging.WARNING:
+            rate = self._logger_rate(record.name)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        key = (record.name, str(record.msg))
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        record.sample_rate = rate
+        return count % max(1, round(1 / rate)) == 0
+
+_exception_formatter = logging.Formatter()
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the logging thread: when the queue is full the
+    record is dropped and counted. The message and any traceback are rendered on the
+    calling thread, so mutable arguments are logged as they were at the call and no
+    frames are kept alive in the queue; redaction and JSON encoding happen on the
+    listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Context variables are only visible on the calling thread
+        if getattr(record, "conversation_id", None) is None:
+            record.conversation_id = get_conversation_id()
+        # The record is copied so handlers on other loggers still see the original arguments
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        # Render the traceback here too, so queued records hold no frame references
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"queued": self.queue.qsize(), "dropped": self.dropped}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
+def configure_logging(level: Optional[str] = None, json_output: Optional[bool] = None, stream: Any = None) -> None:
+    """
+    Route all logging through one bounded queue drained by a background listener thread
+    that writes structured, redacted lines. Safe to call more than once; later calls
+    are ignored.
+
+    Args:
+        level (str, optional): Root log level; defaults to LOG_LEVEL or INFO.
+        json_output (bool, optional): JSON lines, or plain text; defaults to LOG_FORMAT (json).
+        stream (optional): Output stream; defaults to stdout.
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        level = level or os.getenv(constants.LOG_LEVEL_ENV_VAR, constants.LOG_LEVEL)
+        if json_output is None:
+            json_output = os.getenv(constants.LOG_FORMAT_ENV_VAR, "json").lower() == "json"
+
+        for name in constants.SECRET_ENV_VARS:
+            add_secret(os.getenv(name))
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(StructuredFormatter(json_output))
+
+        log_queue: queue.Queue = queue.Queue(constants.LOG_QUEUE_SIZE)
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(constants.LOG_SAMPLE_RATES))
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level.upper())
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        registry.register_stats("agent_logging", handler.stats)
+
@@ -0,0 +1,95 @@
+import asyncio
+import contextlib
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from telemetry.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_conversation_id: ContextVar[Optional[str]] = ContextVar("conversation_id", default=None)
+
+SPAN_DURATION = registry.histogram(
+    "agent_span_duration_seconds",
+    "Duration of instrumented operations (LLM steps, tools, 1inch HTTP, RPC, DB)",
+    labels=("kind", "name", "status")
+)
+
+def get_conversation_id() -> Optional[str]:
+    """Return the conversation the current code runs on behalf of, if any."""
+    return _conversation_id.get()
+
+@contextlib.contextmanager
+def conversation_context(conversation_id: Any) -> Iterator[None]:
+    """
+    Tag every span recorded inside the block, including in tool threads started from
+    it, with a conversation id.
+    """
+    token = _conversation_id.set(str(conversation_id))
+    try:
+        yield
+    finally:
+        try:
+            _conversation_id.reset(token)
+        except ValueError:
+            # A streaming generator finalized from another context; nothing to restore
+            pass
+
+def record_span(kind: str, name: str, duration: float, status: str = "ok", conversation_id: Optional[str] = None) -> None:
+    """
+    Record a finished span in the duration histogram and the debug log.
+
+    Args:
+        kind (str): Span category: llm, tool, oneinch_http, rpc, db or turn.
+        name (str): Operation within the category, e.g. a tool name or RPC method.
+        duration (float): Seconds taken.
+        status (str): "ok", "error" or "cancelled".
+        conversation_id (str, optional): Defaults to the current conversation.
+    """
+    SPAN_DURATION.observe(duration, kind=kind, name=name, status=status)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("span %s %s %.6fs %s", kind, name, duration, status, extra={
+            "span": {
+                "kind": kind,
+                "name": name,
+                "duration_seconds": round(duration, 6),
+                "status": status,
+                "conversation_id": conversation_id or get_conversation_id()
+            }
+        })
+
+@contextlib.contextmanager
+def span(kind: str, name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as a span; exceptions mark it as an error and propagate.
+    A closed stream or cancelled task is recorded as "cancelled".
+    """
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except (GeneratorExit, asyncio.CancelledError):
+        status = "cancelled"
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        record_span(kind, name, time.perf_counter() - start, status)
+
+def traced(kind: str, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording each call of a function as a span, named after the function by default.
+    """
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(kind, span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
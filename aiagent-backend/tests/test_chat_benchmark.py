@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class ChatBenchmarkSmokeTest(unittest.TestCase):
+    """
+    Run the offline chat benchmark for two sequential turns against each server. Each
+    run is a separate process, as the app modules read the stand-ins' URLs at import.
+    """
+
+    def run_benchmark(self, server: str) -> dict:
+        with tempfile.TemporaryDirectory() as work_dir:
+            output = os.path.join(work_dir, "chat.json")
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.chat",
+                    "--server", server,
+                    "--turns", "2",
+                    "--concurrency", "1",
+                    "--duration", "0",
+                    "--llm-latency", "0",
+                    "--rpc-latency", "0",
+                    "--oneinch-latency", "0",
+                    "--output", output,
+                ],
+                cwd=BACKEND_DIR,
+                check=True,
+                capture_output=True,
+                timeout=180
+            )
+            with open(output) as file:
+                return json.load(file)
+
+    def assert_sequential_turns(self, results: dict) -> None:
+        sequential = results["sequential"]
+        self.assertEqual(sequential["turns"], 2)
+        self.assertEqual(sequential["errors"], 0)
+        self.assertEqual(sequential["turn_latency"]["count"], 2)
+
+    def test_flask_server(self):
+        self.assert_sequential_turns(self.run_benchmark("flask"))
+
+    def test_async_server(self):
+        self.assert_sequential_turns(self.run_benchmark("async"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.constants import ERROR
+
+import constants
+from agent.checkpointer import SqliteCheckpointSaver
+from db.setup import setup
+from db.storage import close_connections, get_connection
+
+def thread_config(thread_id, checkpoint_id=None):
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": "", "checkpoint_id": checkpoint_id}}
+
+class SqliteCheckpointSaverTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        env = mock.patch.dict(os.environ, {constants.DB_PATH_ENV_VAR: os.path.join(work_dir.name, "test.db")})
+        env.start()
+        self.addCleanup(env.stop)
+        close_connections()
+        self.addCleanup(close_connections)
+        setup()
+
+    def put(self, saver, thread_id, step, parent_id=None):
+        """Store checkpoint `step` of a thread; ids sort in step order, like the uuid6 ids langgraph makes."""
+        checkpoint = empty_checkpoint()
+        checkpoint["id"] = f"{step:08d}"
+        return saver.put(thread_config(thread_id, parent_id), checkpoint, {"source": "loop", "step": step, "writes": None}, {})
+
+    def put_steps(self, saver, thread_id, steps):
+        parent_id = None
+        for step in range(1, steps + 1):
+            parent_id = self.put(saver, thread_id, step, parent_id)["configurable"]["checkpoint_id"]
+
+    def ids(self, checkpoint_tuples):
+        return [checkpoint_tuple.config["configurable"]["checkpoint_id"] for checkpoint_tuple in checkpoint_tuples]
+
+    def test_put_round_trips_through_get_tuple_and_list(self):
+        saver = SqliteCheckpointSaver()
+        self.put_steps(saver, "thread", 3)
+
+        latest = saver.get_tuple(thread_config("thread"))
+        self.assertEqual(latest.checkpoint["id"], "00000003")
+        self.assertEqual(latest.metadata["step"], 3)
+        self.assertEqual(latest.parent_config["configurable"]["checkpoint_id"], "00000002")
+
+        first = saver.get_tuple(thread_config("thread", "00000001"))
+        self.assertEqual(first.checkpoint["id"], "00000001")
+        self.assertIsNone(first.parent_config)
+
+        self.assertEqual(self.ids(saver.list(thread_config("thread"))), ["00000003", "00000002", "00000001"])
+        self.assertEqual(self.ids(saver.list(thread_config("thread"), before=thread_config("thread", "00000003"))), ["00000002", "00000001"])
+        self.assertEqual(self.ids(saver.list(thread_config("thread"), limit=1)), ["00000003"])
+        self.assertEqual(self.ids(saver.list(thread_config("thread"), filter={"step": 2})), ["00000002"])
+        self.assertIsNone(saver.get_tuple(thread_config("other")))
+
+    def test_put_writes_replaces_special_writes_and_ignores_duplicate_regular_writes(self):
+        saver = SqliteCheckpointSaver()
+        config = self.put(saver, "thread", 1)
+
+        saver.put_writes(config, [("messages", "first")], "task")
+        saver.put_writes(config, [("messages", "second")], "task")
+        saver.put_writes(config, [(ERROR, "first error")], "task")
+        saver.put_writes(config, [(ERROR, "second error")], "task")
+
+        expected = [("task", ERROR, "second error"), ("task", "messages", "first")]
+        self.assertEqual(sorted(saver.get_tuple(config).pending_writes), sorted(expected))
+        # A fresh saver has nothing in memory and reads the same writes from the database
+        self.assertEqual(sorted(SqliteCheckpointSaver().get_tuple(config).pending_writes), sorted(expected))
+
+    def test_trim_keeps_the_newest_checkpoints(self):
+        saver = SqliteCheckpointSaver(keep_checkpoints=2)
+        self.put_steps(saver, "thread", 5)
+
+        self.assertEqual(self.ids(saver.list(thread_config("thread"))), ["00000005", "00000004"])
+        count = get_connection().execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", ("thread",)).fetchone()[0]
+        self.assertEqual(count, 2)
+
+    def test_prune_drops_threads_past_the_ttl(self):
+        saver = SqliteCheckpointSaver(ttl_seconds=60)
+        self.put_steps(saver, "old", 2)
+        self.put_steps(saver, "new", 2)
+        get_connection().execute("UPDATE checkpoint_threads SET updated_at = ? WHERE thread_id = ?", (time.time() - 120, "old"))
+
+        self.assertEqual(saver.prune(), 1)
+        self.assertIsNone(saver.get_tuple(thread_config("old")))
+        self.assertEqual(list(saver.list(thread_config("old"))), [])
+        self.assertEqual(saver.get_tuple(thread_config("new")).checkpoint["id"], "00000002")
+
+    def test_evicted_thread_is_read_back_from_the_database(self):
+        saver = SqliteCheckpointSaver(cache_size=1)
+        config = self.put(saver, "first", 1)
+        saver.put_writes(config, [("messages", "hello")], "task")
+        cached = saver.get_tuple(thread_config("first"))
+
+        self.put(saver, "second", 1)
+        self.assertNotIn(("first", ""), saver._hot)
+
+        loaded = saver.get_tuple(thread_config("first"))
+        self.assertEqual(loaded.checkpoint, cached.checkpoint)
+        self.assertEqual(loaded.metadata, cached.metadata)
+        self.assertEqual(loaded.pending_writes, cached.pending_writes)
+        self.assertIn(("first", ""), saver._hot)
+
+if __name__ == "__main__":
+    unittest.main()
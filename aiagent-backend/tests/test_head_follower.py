@@ -0,0 +1,40 @@
+import unittest
+
+from benchmarks.stubs import JsonRpcStub
+from chain.head_follower import BlockHeadFollower
+
+def summarize(block):
+    return {"block_number": block.number, "transactions_count": len(block.transactions)}
+
+class BlockHeadFollowerTest(unittest.TestCase):
+    def setUp(self):
+        # A fixed head, so polls after the first find nothing new to fetch
+        self.stub = JsonRpcStub(tx_per_block=5, block_time=3600).start()
+        self.addCleanup(self.stub.stop)
+
+    def test_polling_thread_exits_when_idle(self):
+        follower = BlockHeadFollower(self.stub.url, summarize, history_size=2, poll_interval=0.01, idle_timeout=0.1)
+        self.addCleanup(follower.stop)
+        follower.start()
+        thread = follower._thread
+
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNotNone(follower.latest(allow_stale=True))
+
+        follower.start()
+        self.assertTrue(follower._thread.is_alive())
+
+    def test_paged_block_is_fetched_once(self):
+        follower = BlockHeadFollower(self.stub.url, summarize, history_size=2, background=False)
+        head = follower.refresh()["block_number"]
+        requests = self.stub.requests
+
+        older = follower.page_block(head - 1)
+        self.assertEqual(older.number, head - 1)
+        self.assertIs(follower.page_block(head - 1), older)
+        self.assertEqual(follower.page_block(head).number, head)
+        self.assertEqual(self.stub.requests, requests + 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import constants
+from db import listing
+from db.setup import setup
+from db.storage import close_connections
+from db.tokens import add_token, get_tokens_page
+
+class ListingCacheTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        env = mock.patch.dict(os.environ, {constants.DB_PATH_ENV_VAR: os.path.join(work_dir.name, "test.db")})
+        env.start()
+        self.addCleanup(env.stop)
+        close_connections()
+        self.addCleanup(close_connections)
+        setup()
+        listing.invalidate("tokens")
+
+        self.fetches = 0
+
+    def fetch_page(self, after, limit):
+        self.fetches += 1
+        return get_tokens_page(after, limit)
+
+    def test_pages_follow_next_after(self):
+        for index in range(3):
+            add_token(f"0x{index:040x}")
+
+        first, _ = listing.get_listing("tokens", self.fetch_page, 0, 2)
+        self.assertEqual(first["tokens"], [f"0x{0:040x}", f"0x{1:040x}"])
+        self.assertIsNotNone(first["next_after"])
+
+        second, _ = listing.get_listing("tokens", self.fetch_page, first["next_after"], 2)
+        self.assertEqual(second["tokens"], [f"0x{2:040x}"])
+        self.assertIsNone(second["next_after"])
+
+    def test_unlimited_page_has_no_cursor(self):
+        add_token(f"0x{0:040x}")
+        payload, _ = listing.get_listing("tokens", self.fetch_page)
+        self.assertEqual(len(payload["tokens"]), 1)
+        self.assertIsNone(payload["next_after"])
+
+    def test_pages_are_cached_until_a_write(self):
+        add_token(f"0x{0:040x}")
+        _, etag = listing.get_listing("tokens", self.fetch_page)
+        _, cached_etag = listing.get_listing("tokens", self.fetch_page)
+        self.assertEqual(self.fetches, 1)
+        self.assertEqual(cached_etag, etag)
+
+        add_token(f"0x{1:040x}")
+        payload, new_etag = listing.get_listing("tokens", self.fetch_page)
+        self.assertEqual(self.fetches, 2)
+        self.assertEqual(len(payload["tokens"]), 2)
+        self.assertNotEqual(new_etag, etag)
+
+    def test_page_read_during_a_write_is_not_cached(self):
+        def racing_fetch(after, limit):
+            rows = self.fetch_page(after, limit)
+            listing.invalidate("tokens")
+            return rows
+
+        listing.get_listing("tokens", racing_fetch)
+        listing.get_listing("tokens", self.fetch_page)
+        self.assertEqual(self.fetches, 2)
+
+    def test_least_recently_used_pages_are_evicted(self):
+        with mock.patch.object(constants, "LISTING_CACHE_PAGES", 2):
+            listing.get_listing("tokens", self.fetch_page, 0, 1)
+            listing.get_listing("tokens", self.fetch_page, 0, 2)
+            listing.get_listing("tokens", self.fetch_page, 0, 1)
+            listing.get_listing("tokens", self.fetch_page, 0, 3)
+            self.assertEqual(self.fetches, 3)
+
+            listing.get_listing("tokens", self.fetch_page, 0, 1)
+            listing.get_listing("tokens", self.fetch_page, 0, 2)
+            self.assertEqual(self.fetches, 4)
+
+class ListingEndpointTest(unittest.TestCase):
+    """Conditional GETs against the Flask app, imported with warm-up off and a temporary database."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.work_dir = tempfile.TemporaryDirectory()
+        cls.env = mock.patch.dict(os.environ, {
+            constants.DB_PATH_ENV_VAR: os.path.join(cls.work_dir.name, "test.db"),
+            constants.AGENT_WARMUP_ENV_VAR: "0"
+        })
+        cls.env.start()
+        close_connections()
+
+        import index
+        cls.client = index.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        close_connections()
+        cls.env.stop()
+        cls.work_dir.cleanup()
+
+    def test_matching_etag_answers_304(self):
+        response = self.client.get("/tokens?limit=10")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+
+        response = self.client.get("/tokens?limit=10", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        add_token(f"0x{9:040x}")
+        response = self.client.get("/tokens?limit=10", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+if __name__ == "__main__":
+    unittest.main()
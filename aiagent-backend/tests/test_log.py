@@ -0,0 +1,80 @@
+import json
+import logging
+import queue
+import unittest
+from unittest import mock
+
+import constants
+from telemetry import log
+from telemetry.log import NonBlockingQueueHandler, SamplingFilter, StructuredFormatter, add_secret, redact
+
+def make_record(msg, *args, name="test", level=logging.INFO, **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+class RedactionTest(unittest.TestCase):
+    def setUp(self):
+        secrets = mock.patch.object(log, "_secrets", set())
+        secrets.start()
+        self.addCleanup(secrets.stop)
+        pattern = mock.patch.object(log, "_secrets_pattern", None)
+        pattern.start()
+        self.addCleanup(pattern.stop)
+
+    def test_registered_secret_is_masked_as_a_whole_token(self):
+        secret = "s3cr3t-wallet-seed-value"
+        add_secret(secret)
+        self.assertEqual(redact(f"seed is {secret}."), "seed is [REDACTED].")
+        self.assertEqual(redact(f"x{secret}"), f"x{secret}")
+
+    def test_short_secret_is_ignored(self):
+        add_secret("a" * (constants.LOG_SECRET_MIN_LENGTH - 1))
+        self.assertIsNone(log._secrets_pattern)
+
+    def test_bearer_tokens_and_sensitive_keys_are_masked(self):
+        self.assertEqual(redact("sent Bearer abc.def upstream"), "sent Bearer [REDACTED] upstream")
+        self.assertEqual(redact('{"api_key": "k-123", "amount": 5}'), '{"api_key": [REDACTED], "amount": 5}')
+        self.assertEqual(redact("private_key=0xabc next"), "private_key=[REDACTED] next")
+
+    def test_json_lines_redact_extra_fields(self):
+        record = make_record("wallet %s", "loaded", payload={"seed": "words", "chain": 8453})
+        entry = json.loads(StructuredFormatter().format(record))
+        self.assertEqual(entry["message"], "wallet loaded")
+        self.assertEqual(entry["payload"], {"seed": "[REDACTED]", "chain": 8453})
+
+class SamplingFilterTest(unittest.TestCase):
+    def test_keeps_one_in_every_n_records_per_template(self):
+        sampler = SamplingFilter()
+        kept = [sampler.filter(make_record("poll failed", sample_rate=0.25)) for _ in range(8)]
+        self.assertEqual(kept.count(True), 2)
+        self.assertTrue(sampler.filter(make_record("other event", sample_rate=0.25)))
+
+    def test_logger_rates_apply_below_warning(self):
+        sampler = SamplingFilter({"chain": 0.5})
+        kept = [sampler.filter(make_record("block", name="chain.head_follower")) for _ in range(4)]
+        self.assertEqual(kept.count(True), 2)
+        warnings = [sampler.filter(make_record("block", name="chain.head_follower", level=logging.WARNING)) for _ in range(4)]
+        self.assertEqual(warnings.count(True), 4)
+
+    def test_zero_rate_drops_every_record(self):
+        self.assertFalse(SamplingFilter().filter(make_record("noise", sample_rate=0)))
+
+class NonBlockingQueueHandlerTest(unittest.TestCase):
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(1))
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))
+        self.assertEqual(handler.stats(), {"queued": 1, "dropped": 1})
+
+    def test_message_is_rendered_on_the_calling_thread(self):
+        log_queue = queue.Queue()
+        handler = NonBlockingQueueHandler(log_queue)
+        items = ["a"]
+        handler.handle(make_record("items %s", items))
+        items.append("b")
+        self.assertEqual(log_queue.get_nowait().getMessage(), "items ['a']")
+
+if __name__ == "__main__":
+    unittest.main()
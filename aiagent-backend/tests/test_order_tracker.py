@@ -0,0 +1,69 @@
+import time
+import unittest
+
+from oneinch.order_tracker import OrderTracker
+
+class FakeClient:
+    """Order API stand-in answering every status lookup with `status`."""
+
+    def __init__(self, status):
+        self.status = status
+        self.polls = 0
+        self.secrets = 0
+
+    def get_orders_status(self, order_hashes):
+        self.polls += 1
+        if isinstance(self.status, Exception):
+            raise self.status
+        return {order_hash: self.status for order_hash in order_hashes}
+
+    def get_order_status(self, order_hash):
+        return self.status
+
+    def submit_secret(self, order_hash, secret):
+        self.secrets += 1
+        raise RuntimeError("secret rejected")
+
+class OrderTrackerTest(unittest.TestCase):
+    def make_tracker(self, client, **kwargs):
+        tracker = OrderTracker(client, min_interval=0.01, max_interval=0.02, **kwargs)
+        self.addCleanup(tracker.stop)
+        return tracker
+
+    def test_failing_poll_keeps_the_thread_alive(self):
+        client = FakeClient(RuntimeError("upstream down"))
+        tracker = self.make_tracker(client)
+        tracker.track("0xabc", "secret")
+
+        deadline = time.monotonic() + 2
+        while client.polls < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertGreaterEqual(client.polls, 3)
+        self.assertTrue(tracker._thread.is_alive())
+
+    def test_malformed_status_body_is_ignored(self):
+        client = FakeClient(["not", "a", "dict"])
+        tracker = self.make_tracker(client)
+        tracker.track("0xabc", "secret")
+
+        deadline = time.monotonic() + 2
+        while client.polls < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertTrue(tracker._thread.is_alive())
+        self.assertIsNone(tracker.status("0xabc")["status"])
+
+    def test_ready_order_with_rejected_secret_expires(self):
+        client = FakeClient({"status": "ready"})
+        tracker = self.make_tracker(client, max_age=0.1)
+        tracker.track("0xabc", "secret")
+
+        state = tracker.wait("0xabc", timeout=2)
+
+        self.assertEqual(state["status"], "untracked")
+        self.assertGreater(client.secrets, 0)
+        self.assertEqual(tracker.open_orders(), [])
+
+if __name__ == "__main__":
+    unittest.main()
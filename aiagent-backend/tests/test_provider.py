@@ -0,0 +1,33 @@
+import threading
+import unittest
+from unittest import mock
+
+from benchmarks.stubs import JsonRpcStub
+from chain.provider import get_session, get_web3
+
+class SharedSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.stub = JsonRpcStub().start()
+        self.addCleanup(self.stub.stop)
+
+    def test_threads_share_one_session(self):
+        session = get_session(self.stub.url)
+        callers = []
+
+        def post(*args, **kwargs):
+            callers.append(threading.get_ident())
+            return original(*args, **kwargs)
+
+        original = session.post
+        with mock.patch.object(session, "post", side_effect=post):
+            threads = [threading.Thread(target=lambda: get_web3(self.stub.url).eth.block_number) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(set(callers)), 2)
+        self.assertEqual(self.stub.requests, 2)
+
+if __name__ == "__main__":
+    unittest.main()
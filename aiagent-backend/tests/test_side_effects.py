@@ -0,0 +1,92 @@
+import atexit
+import importlib
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import constants
+from agent import side_effects
+from agent.side_effects import WriteBehindQueue
+from db.setup import setup
+from db.storage import close_connections, get_connection
+from db.tokens import add_token, get_tokens
+
+class WriteBehindQueueTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        env = mock.patch.dict(os.environ, {constants.DB_PATH_ENV_VAR: os.path.join(work_dir.name, "test.db")})
+        env.start()
+        self.addCleanup(env.stop)
+        close_connections()
+        self.addCleanup(close_connections)
+        setup()
+
+    def test_db_actions_of_a_batch_share_one_transaction(self):
+        def handler(agent_action, content):
+            if content == "fail":
+                raise RuntimeError("no address")
+            return add_token(content)
+
+        statements = []
+        get_connection().set_trace_callback(statements.append)
+        self.addCleanup(get_connection().set_trace_callback, None)
+
+        queue = WriteBehindQueue(handler, {constants.DEPLOY_TOKEN: "tokens"})
+        failed = queue._process([
+            (constants.DEPLOY_TOKEN, f"0x{0:040x}"),
+            (constants.DEPLOY_TOKEN, "fail"),
+            (constants.DEPLOY_TOKEN, f"0x{1:040x}"),
+        ])
+
+        self.assertEqual(failed, 1)
+        self.assertEqual(statements.count("BEGIN"), 1)
+        self.assertEqual(statements.count("COMMIT"), 1)
+        self.assertEqual(get_tokens(), [f"0x{0:040x}", f"0x{1:040x}"])
+
+    def test_full_queue_overflows_db_actions_and_drops_the_rest(self):
+        started = threading.Event()
+        release = threading.Event()
+        handled = []
+
+        def handler(agent_action, content):
+            started.set()
+            release.wait(5)
+            handled.append(content)
+            return True
+
+        queue = WriteBehindQueue(handler, {constants.DEPLOY_TOKEN: "tokens"}, maxsize=1, batch_size=1)
+        queue.submit("report", "first")
+        started.wait(5)
+        queue.submit("report", "queued")
+
+        self.assertTrue(queue.submit_nowait(constants.DEPLOY_TOKEN, "overflowed"))
+        self.assertFalse(queue.submit_nowait("report", "dropped"))
+        self.assertFalse(queue.flush(timeout=0.05))
+
+        release.set()
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(sorted(handled), ["first", "overflowed", "queued"])
+        stats = queue.stats()
+        self.assertEqual(stats["overflowed"], 1)
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["processed"], 3)
+
+    def test_failed_actions_are_counted(self):
+        queue = WriteBehindQueue(lambda agent_action, content: content == "ok", {})
+        queue.submit("report", "ok")
+        queue.submit("report", "fail")
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(queue.stats()["failed"], 1)
+        self.assertEqual(queue.stats()["processed"], 1)
+
+    def test_pending_actions_are_flushed_at_exit(self):
+        with mock.patch.object(atexit, "register") as register:
+            module = importlib.reload(side_effects)
+        self.addCleanup(importlib.reload, side_effects)
+        register.assert_any_call(module.action_queue.flush, constants.SIDE_EFFECT_FLUSH_TIMEOUT_SECONDS)
+
+if __name__ == "__main__":
+    unittest.main()
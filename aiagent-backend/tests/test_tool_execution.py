@@ -0,0 +1,64 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import constants
+from agent import tool_execution
+from agent.tool_execution import KeyedLock, prepare_tools
+from telemetry import conversation_context
+
+class ReadOnlySlotsTest(unittest.TestCase):
+    def setUp(self):
+        slots = mock.patch.object(tool_execution, "_read_only_slots", KeyedLock(2))
+        slots.start()
+        self.addCleanup(slots.stop)
+
+        self.release = threading.Event()
+        self.running = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+        def get_latest_block():
+            conversation = tool_execution.get_conversation_id()
+            with self.lock:
+                self.running[conversation] = self.running.get(conversation, 0) + 1
+                self.peak[conversation] = max(self.peak.get(conversation, 0), self.running[conversation])
+            self.release.wait(5)
+            with self.lock:
+                self.running[conversation] -= 1
+
+        self.tool = prepare_tools([get_latest_block])[0]
+
+    def call(self, conversation_id):
+        def run():
+            with conversation_context(conversation_id):
+                self.tool()
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def wait_running(self, expected):
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            with self.lock:
+                if self.running == expected:
+                    return
+            time.sleep(0.01)
+        self.fail(f"running {self.running}, expected {expected}")
+
+    def test_slots_are_bounded_per_conversation(self):
+        threads = [self.call("busy") for _ in range(4)] + [self.call("other")]
+        self.wait_running({"busy": 2, "other": 1})
+
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(self.peak, {"busy": 2, "other": 1})
+
+    def test_read_only_classification_covers_the_toolkit_tools(self):
+        self.assertTrue(constants.CDP_READ_ONLY_TOOLS <= constants.READ_ONLY_TOOLS)
+        self.assertNotIn(constants.SWAP_TOKENS, constants.READ_ONLY_TOOLS)
+
+if __name__ == "__main__":
+    unittest.main()
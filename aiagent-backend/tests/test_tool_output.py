@@ -0,0 +1,41 @@
+import json
+import unittest
+from unittest import mock
+
+from agent import tool_output
+from agent.tool_output import ToolResultStore, compact_tool, get_full_tool_result
+from telemetry import conversation_context
+
+def get_latest_block():
+    """Stand-in for the block tool."""
+    return {"block_number": 7, "address_summary": {"unique_senders": ["0xa"], "unique_receivers": [], "total_unique_addresses": 1}}
+
+class ToolResultStoreTest(unittest.TestCase):
+    def setUp(self):
+        store = mock.patch.object(tool_output, "tool_result_store", ToolResultStore(max_entries=1))
+        store.start()
+        self.addCleanup(store.stop)
+        self.tool = compact_tool(get_latest_block)
+
+    def run_tool(self, conversation_id):
+        with conversation_context(conversation_id):
+            return json.loads(self.tool.invoke({}))["result_id"]
+
+    def test_full_result_is_read_back_by_its_conversation(self):
+        result_id = self.run_tool("alice")
+        with conversation_context("alice"):
+            self.assertEqual(get_full_tool_result(result_id, "address_summary.unique_senders"), ["0xa"])
+
+    def test_other_conversations_cannot_read_the_result(self):
+        result_id = self.run_tool("alice")
+        with conversation_context("bob"):
+            self.assertIn("expired", get_full_tool_result(result_id)["error"])
+
+    def test_evicted_result_is_reported_expired(self):
+        result_id = self.run_tool("alice")
+        self.run_tool("alice")
+        with conversation_context("alice"):
+            self.assertIn("expired", get_full_tool_result(result_id)["error"])
+
+if __name__ == "__main__":
+    unittest.main()
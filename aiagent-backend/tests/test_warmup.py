@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from agent.warmup import AgentWarmup
+
+class WarmupFailureTest(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+        def failing_initializer():
+            self.release.wait()
+            raise RuntimeError("no API key")
+
+        self.warmup = AgentWarmup(failing_initializer)
+        self.warmup.start()
+
+    def test_wait_returns_once_initialization_fails(self):
+        threading.Timer(0.1, self.release.set).start()
+        start = time.monotonic()
+        self.assertIsNone(self.warmup.wait(timeout=5))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(self.warmup.status()["state"], "failed")
+
+    def test_wait_async_returns_once_initialization_fails(self):
+        async def wait():
+            asyncio.get_running_loop().call_later(0.1, self.release.set)
+            return await self.warmup.wait_async(timeout=5)
+
+        start = time.monotonic()
+        self.assertIsNone(asyncio.run(wait()))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(self.warmup.status()["error"], "no API key")
+
+    def test_wait_after_failure_does_not_block(self):
+        self.release.set()
+        self.warmup.wait(timeout=5)
+        start = time.monotonic()
+        self.assertIsNone(self.warmup.wait(timeout=5))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
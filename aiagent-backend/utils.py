@@ -1,6 +1,8 @@
 import json
+import requests
+from requests.adapters import HTTPAdapter
 
-def format_sse(data: str, event: str = None, functions: str = []) -> str:
+def format_sse(data: str, event: str = None, functions: str = [], partial: bool = False) -> str:
     """Format data as SSE"""
     response = {
         "event": event,
@@ -8,4 +10,14 @@ def format_sse(data: str, event: str = None, functions: str = []) -> str:
     }
     if (len(functions) > 0):
         response["functions"] = functions
-    return json.dumps(response) + "\n"
\ No newline at end of file
+    if partial:
+        response["partial"] = True
+    return json.dumps(response) + "\n"
+
+def build_http_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive HTTP session with a connection pool of the given size"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -48,7 +48,7 @@ export default function Chat({ className, getNFTs, getTokens }: ChatProps) {
       setShouldRefetchTokens(true);
     }
 
-    let message = messages.find((res) => res.event === 'agent');
+    let message = messages.find((res) => res.event === 'agent' && !res.partial);
     if (!message) {
       message = messages.find((res) => res.event === 'tools');
     }
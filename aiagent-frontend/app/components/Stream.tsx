@@ -18,7 +18,7 @@ export default function Stream({ className }: StreamProps) {
   const bottomRef = useRef<HTMLDivElement>(null);
 
   const handleSuccess = useCallback((messages: AgentMessage[]) => {
-    let message = messages.find((res) => res.event === 'agent');
+    let message = messages.find((res) => res.event === 'agent' && !res.partial);
     if (!message) {
       message = messages.find((res) => res.event === 'tools');
     }
@@ -29,4 +29,5 @@ export type AgentMessage = {
   data?: string;
   event: 'agent' | 'tools' | 'completed' | 'error';
   functions?: string[];
+  partial?: boolean;
 };